@@ -150,39 +150,42 @@ class ArchitectAgent(BaseAgent):
                 files=comp.get('files', [])
             )
 
-            # Save metrics to metrics table
-            for metric in comp.get('metrics', []):
-                self.db.create_metric(
-                    component_id=comp_id,
-                    requirement=metric.get('name', 'Unknown Metric'),
-                    value=metric.get('target'),
-                    status=metric.get('status', 'pending'),
-                    weight=metric.get('weight', 1.0)
+            # Save metrics to metrics table (batched into one transaction)
+            self.db.create_metrics(comp_id, [
+                (
+                    metric.get('name', 'Unknown Metric'),
+                    metric.get('target'),
+                    metric.get('status', 'pending'),
+                    metric.get('weight', 1.0)
                 )
-
-            # Save test cases to test_cases table
-            for test in comp.get('test_cases', []):
-                self.db.create_test_case(
-                    component_id=comp_id,
-                    name=test.get('name', 'Unknown Test'),
-                    status=test.get('status', 'pending'),
-                    value=test.get('description'),
-                    weight=test.get('weight', 1.0)
+                for metric in comp.get('metrics', [])
+            ])
+
+            # Save test cases to test_cases table (batched into one transaction)
+            self.db.create_test_cases(comp_id, [
+                (
+                    test.get('name', 'Unknown Test'),
+                    test.get('status', 'pending'),
+                    test.get('description'),
+                    test.get('weight', 1.0)
                 )
+                for test in comp.get('test_cases', [])
+            ])
 
+        # Handle both 'from'/'to' and 'from_id'/'to_id' formats;
+        # insert all edges in one batched transaction
+        edge_rows = []
         for edge in edges:
-            # Handle both 'from'/'to' and 'from_id'/'to_id' formats
             from_id = edge.get('from_id') or edge.get('from')
             to_id = edge.get('to_id') or edge.get('to')
-
             if from_id and to_id:
-                self.db.create_edge(
-                    project_id=project_id,
-                    from_id=from_id,
-                    to_id=to_id,
-                    label=edge.get('label'),
-                    type=edge.get('type', 'data')
-                )
+                edge_rows.append((
+                    from_id,
+                    to_id,
+                    edge.get('label'),
+                    edge.get('type', 'data')
+                ))
+        self.db.create_edges(project_id, edge_rows)
 
         # Save architecture notes to project if present
         arch_notes = design.get('architecture_notes')
@@ -13,9 +13,8 @@ from dataclasses import dataclass
 from datetime import datetime
 
 from .rate_limiter import RateLimiter
-import sys
-# Add parent directory to path for db import
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+# The entrypoint (server.py / tests) puts the Visual directory on sys.path
 try:
     from db import Database
 except ImportError:
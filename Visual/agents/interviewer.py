@@ -2,17 +2,18 @@
 Interviewer Agent - Phase 1 of the orchestration pipeline.
 Analyzes user input and creates structured project briefs.
 """
-import os
-import sys
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import uuid
 
 from .base_agent import BaseAgent
 
-# Add parent directory to path for db import
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-from db import Database, Project, Component
+# The entrypoint (server.py / tests) puts the Visual directory on sys.path
+try:
+    from db import Database, Project, Component
+except ImportError:
+    # Fallback if running from root
+    from Visual.db import Database, Project, Component
 
 
 class InterviewerAgent(BaseAgent):
@@ -300,20 +301,19 @@ class InterviewerAgent(BaseAgent):
                 subtasks=comp.get('subtasks', [])
             )
 
-        # Save edges (only if both components exist)
+        # Save edges in one batched transaction (only if both components exist)
         component_ids = {c['id'] for c in brief.get('components', [])}
-        for edge in brief.get('edges', []):
-            from_id = edge.get('from', '')
-            to_id = edge.get('to', '')
-            # Only create edge if both components exist
-            if from_id in component_ids and to_id in component_ids:
-                self.db.create_edge(
-                    project_id=project_id,
-                    from_id=from_id,
-                    to_id=to_id,
-                    label=edge.get('label', ''),
-                    type=edge.get('type', 'data')
-                )
+        self.db.create_edges(project_id, [
+            (
+                edge.get('from', ''),
+                edge.get('to', ''),
+                edge.get('label', ''),
+                edge.get('type', 'data')
+            )
+            for edge in brief.get('edges', [])
+            if edge.get('from', '') in component_ids
+            and edge.get('to', '') in component_ids
+        ])
 
         # Save global tasks (phases)
         global_phases = [
@@ -325,13 +325,9 @@ class InterviewerAgent(BaseAgent):
             ("Phase 6: Assign - Managers assign agents", False),
             ("Phase 7: Execute - Agents complete tasks", False)
         ]
-        for i, (text, done) in enumerate(global_phases):
-            self.db.create_global_task(
-                project_id=project_id,
-                text=text,
-                done=done,
-                sort_order=i
-            )
+        self.db.create_global_tasks(project_id, [
+            (text, done, i) for i, (text, done) in enumerate(global_phases)
+        ])
 
         # Create interviewer agent record
         self.db.create_agent(
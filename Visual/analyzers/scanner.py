@@ -3,13 +3,29 @@ Codebase Scanner - File system analysis for existing projects.
 Detects languages, dependencies, entry points, and suggests components.
 """
 import os
+import re
 import json
+import mmap
+import asyncio
 from pathlib import Path
 from typing import Dict, List, Set, Optional, Any
 from dataclasses import dataclass, field
 from collections import Counter
 
 
+def _count_lines(path: str) -> int:
+    """Count lines by scanning raw bytes for newlines in fixed-size chunks."""
+    lines = 0
+    last = b'\n'
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            lines += chunk.count(b'\n')
+            last = chunk[-1:]
+    if last != b'\n':
+        lines += 1  # final line without trailing newline
+    return lines
+
+
 @dataclass
 class FileInfo:
     """Information about a source file."""
@@ -58,6 +74,12 @@ class CodebaseScanner:
         '.ruff_cache', '.cache', 'target', 'out', 'bin', 'obj'
     }
 
+    # Derived hot-path filters: exact names go in a frozenset (O(1) check);
+    # glob-style entries like '*.egg-info' can't live in a set, so they are
+    # compiled into one regex together with the hidden-dir (leading dot) rule.
+    _IGNORE_DIRS_EXACT = frozenset(d for d in IGNORE_DIRS if '*' not in d)
+    _IGNORE_DIRS_RE = re.compile(r'^(?:\..+|.*\.egg-info)$')
+
     IGNORE_FILES = {
         '.DS_Store', 'Thumbs.db', '.gitignore', '.env', '.env.local',
         'package-lock.json', 'yarn.lock', 'poetry.lock', 'pnpm-lock.yaml',
@@ -93,21 +115,41 @@ class CodebaseScanner:
         '.less': 'Less'
     }
 
-    def __init__(self, root_path: str):
+    # Frozen view of the extension keys for hot-path membership tests
+    # (avoids hashing into the dict twice per file during scans).
+    _LANG_EXT_SET = frozenset(LANGUAGE_EXTENSIONS)
+
+    def __init__(self, root_path: str, max_files: Optional[int] = None):
         """
         Initialize the scanner.
 
         Args:
             root_path: Path to the codebase root directory
+            max_files: Optional budget; scans stop walking once this many
+                source files have been seen. Useful on huge monorepos
+                where a bounded summary is enough.
 
         Raises:
             ValueError: If path does not exist
         """
+        self.max_files = max_files
         self.root_path = Path(root_path).resolve()
         if not self.root_path.exists():
             raise ValueError(f"Path does not exist: {root_path}")
         if not self.root_path.is_dir():
             raise ValueError(f"Path is not a directory: {root_path}")
+        # Root is fixed, so relative paths are a plain prefix slice instead
+        # of PurePath.relative_to's component-by-component walk.
+        self._root_str = str(self.root_path)
+        self._root_prefix_len = len(self._root_str) + 1
+
+    def _rel(self, full: str) -> str:
+        """Return a path string relative to the scan root."""
+        return full[self._root_prefix_len:]
+
+    def _is_ignored_dir(self, name: str) -> bool:
+        """Check a directory name against IGNORE_DIRS (exact, glob and hidden)."""
+        return name in self._IGNORE_DIRS_EXACT or self._IGNORE_DIRS_RE.match(name) is not None
 
     def scan(self) -> AnalysisResult:
         """
@@ -118,69 +160,127 @@ class CodebaseScanner:
         """
         result = AnalysisResult(root_path=str(self.root_path))
 
-        # Scan files
-        result.files = self._scan_files()
+        # Scan files (also tallies source files per top-level directory
+        # so component suggestion doesn't re-walk the tree)
+        result.files, top_counts = self._scan_files()
         result.file_count = len(result.files)
         result.total_lines = sum(f.lines for f in result.files)
 
         # Detect languages
         result.languages = self._detect_languages(result.files)
 
-        # Build directory structure
-        result.structure = self._build_structure()
-
-        # Extract dependencies based on primary language
-        if 'Python' in result.languages:
-            result.dependencies.extend(self._extract_python_deps())
-            result.entry_points.extend(self._find_python_entry_points())
-        if 'JavaScript' in result.languages or 'TypeScript' in result.languages:
-            result.dependencies.extend(self._extract_js_deps())
-            result.entry_points.extend(self._find_js_entry_points())
-        if 'Go' in result.languages:
-            result.entry_points.extend(self._find_go_entry_points())
-        if 'Rust' in result.languages:
-            result.dependencies.extend(self._extract_rust_deps())
-            result.entry_points.extend(self._find_rust_entry_points())
-
-        # Remove duplicates
-        result.dependencies = list(dict.fromkeys(result.dependencies))
-        result.entry_points = list(dict.fromkeys(result.entry_points))
+        # Structure building and the per-language extractions touch disjoint
+        # files, so run them concurrently to overlap the disk latency.
+        structure, deps, entry_points = asyncio.run(
+            self._gather_extractions(result.languages)
+        )
+        result.structure = structure
+        result.dependencies.extend(deps)
+        result.entry_points.extend(entry_points)
 
         # Generate component suggestions
-        result.components = self._suggest_components(result)
+        result.components = self._suggest_components(top_counts)
 
         return result
 
-    def _scan_files(self) -> List[FileInfo]:
-        """Scan all source files in the codebase."""
+    async def _gather_extractions(self, languages: List[str]):
+        """
+        Run _build_structure and the language-specific dependency and
+        entry-point extractors concurrently in worker threads.
+
+        Each producer fills a private list (deduplicated by its own seen-set);
+        the outputs are merged in language order afterwards so results stay
+        deterministic regardless of which thread finishes first.
+        """
+        dep_jobs = []
+        entry_jobs = []
+        if 'Python' in languages:
+            dep_jobs.append(self._extract_python_deps)
+            entry_jobs.append(self._find_python_entry_points)
+        if 'JavaScript' in languages or 'TypeScript' in languages:
+            dep_jobs.append(self._extract_js_deps)
+            entry_jobs.append(self._find_js_entry_points)
+        if 'Go' in languages:
+            entry_jobs.append(self._find_go_entry_points)
+        if 'Rust' in languages:
+            dep_jobs.append(self._extract_rust_deps)
+            entry_jobs.append(self._find_rust_entry_points)
+
+        async def run_producer(producer):
+            out: List[str] = []
+            await asyncio.to_thread(producer, out, set())
+            return out
+
+        results = await asyncio.gather(
+            asyncio.to_thread(self._build_structure),
+            *(run_producer(p) for p in dep_jobs),
+            *(run_producer(p) for p in entry_jobs)
+        )
+
+        structure = results[0]
+        deps, deps_seen = [], set()
+        for out in results[1:1 + len(dep_jobs)]:
+            for item in out:
+                if item not in deps_seen:
+                    deps_seen.add(item)
+                    deps.append(item)
+        entry_points, entries_seen = [], set()
+        for out in results[1 + len(dep_jobs):]:
+            for item in out:
+                if item not in entries_seen:
+                    entries_seen.add(item)
+                    entry_points.append(item)
+
+        return structure, deps, entry_points
+
+    def _scan_files(self) -> tuple:
+        """
+        Scan all source files in the codebase.
+
+        Returns:
+            (files, top_counts) where top_counts maps each top-level
+            directory to its source-file count.
+        """
         files = []
+        top_counts = Counter()
 
-        for root, dirs, filenames in os.walk(self.root_path):
+        # Plain string paths throughout the inner loop; pathlib allocations
+        # dominate profiles of small-file scans.
+        for root, dirs, filenames in os.walk(self._root_str):
             # Filter ignored directories (in-place to affect os.walk)
-            dirs[:] = [d for d in dirs if d not in self.IGNORE_DIRS and not d.startswith('.')]
+            dirs[:] = [d for d in dirs if not self._is_ignored_dir(d)]
 
             for filename in filenames:
                 if filename in self.IGNORE_FILES or filename.startswith('.'):
                     continue
 
-                filepath = Path(root) / filename
-                ext = filepath.suffix.lower()
+                # String-based suffix extraction; building a Path per file
+                # just to read .suffix is surprisingly expensive.
+                dot = filename.rfind('.')
+                ext = filename[dot:].lower() if dot > 0 else ''
 
-                if ext in self.LANGUAGE_EXTENSIONS:
+                if ext in self._LANG_EXT_SET:
+                    full = os.path.join(root, filename)
                     try:
-                        lines = sum(1 for _ in open(filepath, 'r', errors='ignore'))
+                        lines = _count_lines(full)
                     except Exception:
                         lines = 0
 
+                    rel = self._rel(full)
                     files.append(FileInfo(
-                        path=str(filepath.relative_to(self.root_path)),
+                        path=rel,
                         name=filename,
                         extension=ext,
-                        size=filepath.stat().st_size,
+                        size=os.stat(full).st_size,
                         lines=lines
                     ))
+                    first_sep = rel.find(os.sep)
+                    if first_sep != -1:
+                        top_counts[rel[:first_sep]] += 1
+                    if self.max_files is not None and len(files) >= self.max_files:
+                        return files, top_counts  # budget exhausted
 
-        return files
+        return files, top_counts
 
     def _detect_languages(self, files: List[FileInfo]) -> List[str]:
         """Detect primary languages used based on file extensions."""
@@ -200,7 +300,7 @@ class CodebaseScanner:
         structure = {'name': self.root_path.name, 'type': 'folder', 'children': []}
 
         for item in sorted(self.root_path.iterdir()):
-            if item.name in self.IGNORE_DIRS or item.name.startswith('.'):
+            if self._is_ignored_dir(item.name):
                 continue
 
             if item.is_dir():
@@ -211,57 +311,73 @@ class CodebaseScanner:
                 structure['children'].append({
                     'name': item.name,
                     'type': 'file',
-                    'path': str(item.relative_to(self.root_path))
+                    'path': self._rel(str(item))
                 })
 
         return structure
 
     def _build_dir_structure(self, path: Path, depth: int, max_depth: int = 3) -> Optional[Dict]:
-        """Recursively build directory structure with depth limit."""
+        """Build directory structure with depth limit (iterative walk)."""
         if depth > max_depth:
             return None
 
-        children = []
-        for item in sorted(path.iterdir()):
-            if item.name in self.IGNORE_DIRS or item.name.startswith('.'):
-                continue
+        root_node = {'name': path.name, 'type': 'folder', 'children': []}
+        # Explicit stack instead of recursion: wide trees would otherwise
+        # pay a Python frame per directory, and raising max_depth later
+        # could not hit the recursion limit.
+        stack = [(path, depth, root_node)]
+        folders = [(None, root_node)]  # (parent, node) pairs for pruning
+
+        while stack:
+            current, d, node = stack.pop()
+            for item in sorted(current.iterdir()):
+                if self._is_ignored_dir(item.name):
+                    continue
 
-            if item.is_dir():
-                child = self._build_dir_structure(item, depth + 1, max_depth)
-                if child:
-                    children.append(child)
-            elif item.suffix.lower() in self.LANGUAGE_EXTENSIONS:
-                children.append({
-                    'name': item.name,
-                    'type': 'file',
-                    'path': str(item.relative_to(self.root_path))
-                })
+                if item.is_dir():
+                    if d < max_depth:
+                        child = {'name': item.name, 'type': 'folder', 'children': []}
+                        node['children'].append(child)
+                        folders.append((node, child))
+                        stack.append((item, d + 1, child))
+                elif item.suffix.lower() in self.LANGUAGE_EXTENSIONS:
+                    node['children'].append({
+                        'name': item.name,
+                        'type': 'file',
+                        'path': self._rel(str(item))
+                    })
+
+        # Drop folders that ended up with no source files anywhere below
+        # them. Children were recorded after their parents, so a reverse
+        # pass prunes bottom-up.
+        for parent, folder in reversed(folders):
+            if parent is not None and not folder['children']:
+                parent['children'].remove(folder)
 
-        if children:
-            return {
-                'name': path.name,
-                'type': 'folder',
-                'children': children
-            }
+        if root_node['children']:
+            return root_node
         return None
 
-    def _extract_python_deps(self) -> List[str]:
+    def _extract_python_deps(self, deps: List[str], seen: Set[str]) -> None:
         """Extract Python dependencies from requirements.txt or pyproject.toml."""
-        deps = []
-
-        # Check requirements.txt
+        # Check requirements.txt. The file is mmap'd and parsed as bytes:
+        # everything we split on is ASCII, so decoding the whole file just
+        # to extract package names would be wasted work.
         req_file = self.root_path / 'requirements.txt'
         if req_file.exists():
             try:
-                with open(req_file, 'r') as f:
-                    for line in f:
+                with open(req_file, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for line in iter(mm.readline, b''):
                         line = line.strip()
-                        if line and not line.startswith('#') and not line.startswith('-'):
+                        if line and not line.startswith(b'#') and not line.startswith(b'-'):
                             # Extract package name (before version specifiers)
-                            pkg = line.split('==')[0].split('>=')[0].split('<=')[0]
-                            pkg = pkg.split('<')[0].split('>')[0].split('[')[0].split(';')[0]
-                            if pkg:
-                                deps.append(pkg.strip())
+                            pkg = line.split(b'==')[0].split(b'>=')[0].split(b'<=')[0]
+                            pkg = pkg.split(b'<')[0].split(b'>')[0].split(b'[')[0].split(b';')[0]
+                            pkg = pkg.strip().decode('ascii', 'ignore')
+                            if pkg and pkg not in seen:
+                                seen.add(pkg)
+                                deps.append(pkg)
             except Exception:
                 pass
 
@@ -276,66 +392,65 @@ class CodebaseScanner:
             except Exception:
                 pass
 
-        return deps
-
-    def _extract_js_deps(self) -> List[str]:
+    def _extract_js_deps(self, deps: List[str], seen: Set[str]) -> None:
         """Extract JavaScript/TypeScript dependencies from package.json."""
-        deps = []
-
         pkg_file = self.root_path / 'package.json'
         if pkg_file.exists():
             try:
                 with open(pkg_file, 'r') as f:
                     pkg = json.load(f)
-                deps.extend(pkg.get('dependencies', {}).keys())
+                for name in pkg.get('dependencies', {}):
+                    if name not in seen:
+                        seen.add(name)
+                        deps.append(name)
                 # Optionally include devDependencies for tooling context
-                # deps.extend(pkg.get('devDependencies', {}).keys())
+                # (same loop over pkg.get('devDependencies', {}))
             except (json.JSONDecodeError, Exception):
                 pass
 
-        return deps
-
-    def _extract_rust_deps(self) -> List[str]:
+    def _extract_rust_deps(self, deps: List[str], seen: Set[str]) -> None:
         """Extract Rust dependencies from Cargo.toml."""
-        deps = []
-
+        # Parsed via mmap as bytes for the same reason as requirements.txt:
+        # the section headers and '=' splits are all ASCII.
         cargo_file = self.root_path / 'Cargo.toml'
         if cargo_file.exists():
             try:
-                content = cargo_file.read_text()
-                in_deps = False
-                for line in content.split('\n'):
-                    if line.strip() == '[dependencies]':
-                        in_deps = True
-                        continue
-                    if line.startswith('[') and in_deps:
-                        break
-                    if in_deps and '=' in line:
-                        pkg = line.split('=')[0].strip()
-                        if pkg and not pkg.startswith('#'):
-                            deps.append(pkg)
+                with open(cargo_file, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    in_deps = False
+                    for line in iter(mm.readline, b''):
+                        if line.strip() == b'[dependencies]':
+                            in_deps = True
+                            continue
+                        if line.startswith(b'[') and in_deps:
+                            break
+                        if in_deps and b'=' in line:
+                            pkg = line.split(b'=')[0].strip().decode('ascii', 'ignore')
+                            if pkg and not pkg.startswith('#') and pkg not in seen:
+                                seen.add(pkg)
+                                deps.append(pkg)
             except Exception:
                 pass
 
-        return deps
-
-    def _find_python_entry_points(self) -> List[str]:
+    def _find_python_entry_points(self, entry_points: List[str], seen: Set[str]) -> None:
         """Find Python entry points (main.py, __main__.py, etc.)."""
-        entry_points = []
         patterns = ['main.py', 'app.py', '__main__.py', 'cli.py', 'run.py', 'server.py']
 
         for pattern in patterns:
             matches = list(self.root_path.rglob(pattern))
             for match in matches[:3]:  # Limit to 3 per pattern
-                rel_path = str(match.relative_to(self.root_path))
-                if '__pycache__' not in rel_path and 'test' not in rel_path.lower():
+                rel_path = self._rel(str(match))
+                if ('__pycache__' not in rel_path and 'test' not in rel_path.lower()
+                        and rel_path not in seen):
+                    seen.add(rel_path)
                     entry_points.append(rel_path)
 
-        return entry_points
-
-    def _find_js_entry_points(self) -> List[str]:
+    def _find_js_entry_points(self, entry_points: List[str], seen: Set[str]) -> None:
         """Find JavaScript/TypeScript entry points."""
-        entry_points = []
+        def add(entry: str):
+            if entry not in seen:
+                seen.add(entry)
+                entry_points.append(entry)
 
         # Check package.json main field
         pkg_file = self.root_path / 'package.json'
@@ -344,9 +459,9 @@ class CodebaseScanner:
                 with open(pkg_file, 'r') as f:
                     pkg = json.load(f)
                 if 'main' in pkg:
-                    entry_points.append(pkg['main'])
+                    add(pkg['main'])
                 if 'module' in pkg:
-                    entry_points.append(pkg['module'])
+                    add(pkg['module'])
             except Exception:
                 pass
 
@@ -358,79 +473,68 @@ class CodebaseScanner:
                 if check_path.exists():
                     match = check_path / pattern
                     if match.exists():
-                        entry_points.append(str(match.relative_to(self.root_path)))
+                        add(self._rel(str(match)))
 
-        return entry_points
-
-    def _find_go_entry_points(self) -> List[str]:
+    def _find_go_entry_points(self, entry_points: List[str], seen: Set[str]) -> None:
         """Find Go entry points (main.go files in cmd/ or root)."""
-        entry_points = []
-
         # Check cmd directory
         cmd_dir = self.root_path / 'cmd'
         if cmd_dir.exists():
             for main_file in cmd_dir.rglob('main.go'):
-                entry_points.append(str(main_file.relative_to(self.root_path)))
+                rel_path = self._rel(str(main_file))
+                if rel_path not in seen:
+                    seen.add(rel_path)
+                    entry_points.append(rel_path)
 
         # Check root
         root_main = self.root_path / 'main.go'
-        if root_main.exists():
+        if root_main.exists() and 'main.go' not in seen:
+            seen.add('main.go')
             entry_points.append('main.go')
 
-        return entry_points
-
-    def _find_rust_entry_points(self) -> List[str]:
+    def _find_rust_entry_points(self, entry_points: List[str], seen: Set[str]) -> None:
         """Find Rust entry points (main.rs, lib.rs)."""
-        entry_points = []
-
         for pattern in ['src/main.rs', 'src/lib.rs', 'main.rs']:
             check_path = self.root_path / pattern
-            if check_path.exists():
+            if check_path.exists() and pattern not in seen:
+                seen.add(pattern)
                 entry_points.append(pattern)
 
-        return entry_points
-
-    def _suggest_components(self, result: AnalysisResult) -> List[Dict]:
-        """Suggest components based on directory structure and patterns."""
+    def _suggest_components(self, top_counts: Counter) -> List[Dict]:
+        """Suggest components from the per-top-level-directory file tally."""
         components = []
 
-        # Top-level directories often represent components/modules
-        for item in self.root_path.iterdir():
-            if item.is_dir() and item.name not in self.IGNORE_DIRS and not item.name.startswith('.'):
-                # Count source files in directory
-                source_files = []
-                for ext in self.LANGUAGE_EXTENSIONS:
-                    source_files.extend(item.rglob(f'*{ext}'))
-
-                file_count = len(source_files)
-                if file_count > 0:
-                    # Determine component type based on common patterns
-                    comp_type = 'module'
-                    name_lower = item.name.lower()
-                    if name_lower in ('api', 'routes', 'endpoints', 'handlers'):
-                        comp_type = 'api'
-                    elif name_lower in ('models', 'entities', 'schemas'):
-                        comp_type = 'data'
-                    elif name_lower in ('services', 'core', 'business'):
-                        comp_type = 'service'
-                    elif name_lower in ('utils', 'helpers', 'lib', 'common'):
-                        comp_type = 'utility'
-                    elif name_lower in ('tests', 'test', 'spec', '__tests__'):
-                        comp_type = 'test'
-                    elif name_lower in ('ui', 'views', 'components', 'pages'):
-                        comp_type = 'ui'
-                    elif name_lower in ('db', 'database', 'migrations'):
-                        comp_type = 'database'
-
-                    components.append({
-                        'id': f'comp_{item.name}',
-                        'label': item.name.replace('_', ' ').replace('-', ' ').title(),
-                        'type': 'node',
-                        'category': comp_type,
-                        'summary': f'Contains {file_count} source files',
-                        'files': [{'name': item.name, 'type': 'folder'}],
-                        'file_count': file_count
-                    })
+        # Top-level directories often represent components/modules.
+        # _scan_files already counted source files per directory, so no
+        # re-walk of the tree is needed here.
+        for name, file_count in top_counts.items():
+            # Determine component type based on common patterns
+            comp_type = 'module'
+            name_lower = name.lower()
+            if name_lower in ('api', 'routes', 'endpoints', 'handlers'):
+                comp_type = 'api'
+            elif name_lower in ('models', 'entities', 'schemas'):
+                comp_type = 'data'
+            elif name_lower in ('services', 'core', 'business'):
+                comp_type = 'service'
+            elif name_lower in ('utils', 'helpers', 'lib', 'common'):
+                comp_type = 'utility'
+            elif name_lower in ('tests', 'test', 'spec', '__tests__'):
+                comp_type = 'test'
+            elif name_lower in ('ui', 'views', 'components', 'pages'):
+                comp_type = 'ui'
+            elif name_lower in ('db', 'database', 'migrations'):
+                comp_type = 'database'
+
+            components.append({
+                'id': f'comp_{name}',
+                'label': name.replace('_', ' ').replace('-', ' ').title(),
+                'type': 'node',
+                'category': comp_type,
+                'summary': f'Contains {file_count} source files',
+                'files': [{'name': name, 'type': 'folder'}],
+                'file_count': file_count
+            })
 
         # Sort by file count (larger components first)
         components.sort(key=lambda x: x.get('file_count', 0), reverse=True)
@@ -446,24 +550,35 @@ class CodebaseScanner:
         ext_counts = Counter()
         file_count = 0
 
-        for root, dirs, filenames in os.walk(self.root_path):
-            dirs[:] = [d for d in dirs if d not in self.IGNORE_DIRS]
+        for root, dirs, filenames in os.walk(self._root_str):
+            dirs[:] = [d for d in dirs if not self._is_ignored_dir(d)]
             for filename in filenames:
-                ext = Path(filename).suffix.lower()
-                if ext in self.LANGUAGE_EXTENSIONS:
+                dot = filename.rfind('.')
+                ext = filename[dot:].lower() if dot > 0 else ''
+                if ext in self._LANG_EXT_SET:
                     ext_counts[ext] += 1
                     file_count += 1
+                    if self.max_files is not None and file_count >= self.max_files:
+                        return {
+                            'root_path': self._root_str,
+                            'file_count': file_count,
+                            'languages': self._rank_languages(ext_counts),
+                            'extension_counts': dict(ext_counts)
+                        }
+
+        return {
+            'root_path': self._root_str,
+            'file_count': file_count,
+            'languages': self._rank_languages(ext_counts),
+            'extension_counts': dict(ext_counts)
+        }
 
+    def _rank_languages(self, ext_counts: Counter) -> List[str]:
+        """Rank detected languages by file count (most common first)."""
         languages = []
         for ext, count in ext_counts.most_common():
             if ext in self.LANGUAGE_EXTENSIONS:
                 lang = self.LANGUAGE_EXTENSIONS[ext]
                 if lang not in languages:
                     languages.append(lang)
-
-        return {
-            'root_path': str(self.root_path),
-            'file_count': file_count,
-            'languages': languages,
-            'extension_counts': dict(ext_counts)
-        }
+        return languages
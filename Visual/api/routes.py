@@ -2,12 +2,10 @@
 API routes for the orchestrator dashboard.
 Handles all REST API endpoints.
 """
-import os
-import sys
-from typing import Optional, Dict, Any
+import json
+from typing import Optional, Dict, Any, Iterator
 
-# Add parent directory to path for db import
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+# The entrypoint (server.py / tests) puts the Visual directory on sys.path
 from db import Database
 from .serializers import GraphSerializer
 
@@ -54,16 +52,44 @@ class APIHandler:
             return None
         return project.to_dict()
 
-    def get_project_graph(self, project_id: str) -> Optional[Dict[str, Any]]:
+    def get_project_graph(self, project_id: str,
+                          fields: Optional[set] = None) -> Optional[Dict[str, Any]]:
         """
         Get project in Graph.html format.
 
-        GET /api/projects/:id/graph
+        GET /api/projects/:id/graph[?fields=nodes,edges]
+
+        Args:
+            project_id: Project ID
+            fields: Optional payload sections to include (skips the
+                queries for the rest); None returns the full payload
 
         Returns:
             Graph.html formatted data or None if not found
         """
-        return self.serializer.serialize_project(project_id)
+        return self.serializer.serialize_project(project_id, fields)
+
+    def get_project_graph_json(self, project_id: str) -> Optional[bytes]:
+        """
+        Get project graph data as pre-serialized JSON bytes.
+
+        GET /api/projects/:id/graph
+
+        Returns:
+            JSON bytes ready to write to the response, or None if not found
+        """
+        return self.serializer.serialize_project_json(project_id)
+
+    def iter_project_graph_json(self, project_id: str) -> Optional[Iterator[bytes]]:
+        """
+        Stream project graph JSON as incremental byte fragments.
+
+        GET /api/projects/:id/graph
+
+        Returns:
+            Iterator of JSON fragments, or None if project not found
+        """
+        return self.serializer.iter_project_json(project_id)
 
     def update_project(self, project_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -198,7 +224,8 @@ class APIHandler:
         if not comp:
             return {"status": "error", "message": "Component not found"}
 
-        files = comp.files or []
+        # comp.files is a shared immutable tuple; copy before appending
+        files = list(comp.files or ())
         file_name = file_path.split('/')[-1]
 
         # Check if file already attached
@@ -268,7 +295,7 @@ class APIHandler:
     # ANALYSIS ENDPOINTS
     # =========================================================================
 
-    def analyze_codebase(self, path: str) -> Dict[str, Any]:
+    def analyze_codebase(self, path: str, limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Analyze a codebase.
 
@@ -276,13 +303,14 @@ class APIHandler:
 
         Args:
             path: Path to the codebase
+            limit: Optional cap on scanned files for large repos
 
         Returns:
             Analysis result or error
         """
         try:
             from analyzers import CodebaseScanner
-            scanner = CodebaseScanner(path)
+            scanner = CodebaseScanner(path, max_files=limit)
             result = scanner.scan()
             return {"status": "success", "analysis": result.to_dict()}
         except ValueError as e:
@@ -333,3 +361,42 @@ class APIHandler:
 
         except Exception as e:
             return {"status": "error", "message": f"Architecture generation failed: {str(e)}"}
+
+    def generate_architecture_stream(
+        self, project_id: str, codebase_path: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """
+        Stream an architecture response as incremental JSON bytes.
+
+        Same payload as generate_architecture, but components and edges are
+        serialized one at a time so the HTTP layer never holds the full
+        JSON blob in memory and the client can start parsing early.
+
+        Yields:
+            UTF-8 encoded JSON fragments forming one complete document
+        """
+        result = self.generate_architecture(project_id, codebase_path)
+        if result.get("status") != "success":
+            yield json.dumps(result).encode('utf-8')
+            return
+
+        architecture = result["architecture"]
+        components = architecture.get("components", [])
+        edges = architecture.get("edges", [])
+        head = {k: v for k, v in architecture.items()
+                if k not in ("components", "edges")}
+
+        yield (
+            f'{{"status": "success", "component_count": {len(components)}, '
+            f'"edge_count": {len(edges)}, "architecture": '
+        ).encode('utf-8')
+        head_json = json.dumps(head)[:-1]  # keep the object open
+        if head:
+            head_json += ', '
+        yield (head_json + '"components": [').encode('utf-8')
+        for i, comp in enumerate(components):
+            yield ((', ' if i else '') + json.dumps(comp)).encode('utf-8')
+        yield b'], "edges": ['
+        for i, edge in enumerate(edges):
+            yield ((', ' if i else '') + json.dumps(edge)).encode('utf-8')
+        yield b']}}'
@@ -1,18 +1,87 @@
 """
 Serializers to convert database models to Graph.html format.
 """
-import os
-import sys
-from typing import Dict, Any, List, Optional
+import json
+from collections import OrderedDict
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
-# Add parent directory to path for db import
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-from db import Database
+# orjson serializes straight to bytes in C; fall back to stdlib json if
+# it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.Fragment (3.9+) splices pre-serialized JSON text straight into
+# the output, so stored JSON columns skip the parse + re-encode round trip.
+_Fragment = getattr(orjson, 'Fragment', None)
+
+# Component columns stored as JSON array text in SQLite
+_COMPONENT_JSON_FIELDS = (
+    'goals', 'scope', 'requirements', 'risks',
+    'inputs', 'outputs', 'files', 'subtasks'
+)
+
+# Node template copied per row (PyDict_Copy) instead of rebuilding the
+# dict literal key-by-key in the hot loop; also fixes the key order.
+_NODE_TEMPLATE = {
+    "id": None,
+    "label": None,
+    "x": 500,
+    "y": 100,
+    "type": "node",
+    "agentId": None,
+    "status": "pending",
+    "lastEdited": None,
+    "summary": "",
+    "problem": "",
+    "goals": None,
+    "scope": None,
+    "requirements": None,
+    "risks": None,
+    "inputs": None,
+    "outputs": None,
+    "files": None,
+    "subtasks": None,
+    "metrics": None,
+    "testCases": None,
+}
+
+# Key tuples for dict(zip(...)) row shaping on the per-component fallback
+_METRIC_KEYS = ("req", "value", "status", "weight")
+_TEST_CASE_KEYS = ("name", "status", "value", "weight")
+
+# Shared sentinel for absent list fields. Read-only by convention: it is
+# only ever handed to the JSON encoder, which doesn't mutate its input.
+# Saves a fresh [] allocation per empty field per node.
+_EMPTY: List[Any] = []
+
+# The entrypoint (server.py / tests) puts the Visual directory on sys.path
+from db import Database, Component
+
+
+def _group_rows(rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Group component_id-sorted row dicts into {component_id: [row, ...]},
+    removing the grouping key from each row.
+    """
+    grouped = {}
+    for comp_id, run in groupby(rows, key=itemgetter('component_id')):
+        bucket = grouped[comp_id] = []
+        for row in run:
+            del row['component_id']
+            bucket.append(row)
+    return grouped
 
 
 class GraphSerializer:
     """Converts database data to Graph.html format."""
 
+    # Max cached serialized-project blobs (LRU eviction)
+    _JSON_CACHE_SIZE = 32
+
     def __init__(self, db: Database):
         """
         Initialize the serializer.
@@ -21,8 +90,12 @@ class GraphSerializer:
             db: Database instance
         """
         self.db = db
+        # Serialized blobs keyed by (project_id, version); a project edit
+        # changes the version, so stale entries simply stop being hit.
+        self._json_cache: 'OrderedDict[Tuple[str, str], bytes]' = OrderedDict()
 
-    def serialize_project(self, project_id: str) -> Optional[Dict[str, Any]]:
+    def serialize_project(self, project_id: str,
+                          fields: Optional[set] = None) -> Optional[Dict[str, Any]]:
         """
         Serialize a project to full Graph.html format.
 
@@ -37,68 +110,123 @@ class GraphSerializer:
 
         Args:
             project_id: The project ID to serialize
+            fields: Optional subset of section names ('nodes', 'edges',
+                'agents', 'globalTasks') to include; None includes all.
+                Omitted sections are neither queried nor emitted.
 
         Returns:
             Dictionary in Graph.html format, or None if project not found
         """
-        project = self.db.get_project(project_id)
-        if not project:
+        return self._build_project(project_id, raw_json=False, fields=fields)
+
+    def _build_project(self, project_id: str, raw_json: bool,
+                       fields: Optional[set] = None) -> Optional[Dict[str, Any]]:
+        """
+        Build the Graph.html payload dict for a project.
+
+        With raw_json=True the component JSON columns are wrapped as
+        orjson.Fragment instead of parsed, so the resulting dict is only
+        valid as input to orjson.dumps (used by serialize_project_json).
+        """
+        # One connection, constant number of statements: project, components,
+        # edges, tasks, agents plus bulk metrics/test cases (no N+1).
+        bundle = self.db.get_project_bundle(project_id, fields)
+        if not bundle:
             return None
 
-        components = self.db.get_components(project_id)
-        edges = self.db.get_edges(project_id)
-        global_tasks = self.db.get_global_tasks(project_id)
-        agents = self.db.get_agents_for_project(project_id)
+        project = bundle.project
 
-        return {
+        data = {
             "projectId": project.id,
             "projectName": project.name,
-            "projectSummary": project.summary or "",
-            "projectProblem": project.problem or "",
+            "projectSummary": project.summary,
+            "projectProblem": project.problem,
             "phase": project.phase,
-            "globalTasks": [
-                {"text": gt.text, "done": bool(gt.done)}
-                for gt in global_tasks
-            ],
-            "agents": [
-                {
-                    "id": a.id,
-                    "name": a.name,
-                    "dept": a.dept or "DEV",
-                    "initials": a.initials or a.name[:2].upper(),
-                    "status": a.status
-                }
-                for a in agents
-            ],
-            "nodes": [
-                self._serialize_component(c)
-                for c in components
-            ],
-            "edges": [
-                {
-                    "from": e.from_id,
-                    "to": e.to_id,
-                    "label": e.label or "",
-                    "type": e.type or "data"
-                }
-                for e in edges
-            ],
-            "timestamp": project.updated_at
         }
+        if fields is None or 'globalTasks' in fields:
+            data["globalTasks"] = bundle.global_tasks
+        if fields is None or 'agents' in fields:
+            data["agents"] = bundle.agents
+        if fields is None or 'nodes' in fields:
+            # Edges, tasks and agents come out of the bundle already in
+            # output shape. Metrics/test cases arrive sorted by
+            # component_id, so group them over run boundaries (one dict
+            # insert per component rather than one hash per row).
+            metrics_by_comp = _group_rows(bundle.metrics)
+            tests_by_comp = _group_rows(bundle.test_cases)
+            data["nodes"] = [
+                self._node_from_row(
+                    row, metrics_by_comp.get(row['id'], _EMPTY),
+                    tests_by_comp.get(row['id'], _EMPTY), raw_json
+                )
+                for row in bundle.components
+            ]
+        if fields is None or 'edges' in fields:
+            data["edges"] = bundle.edges
+        data["timestamp"] = project.updated_at
+        return data
+
+    def _node_from_row(self, row: Dict[str, Any], metrics: List[Dict[str, Any]],
+                       test_cases: List[Dict[str, Any]], raw_json: bool) -> Dict[str, Any]:
+        """
+        Build a Graph.html node from a raw component row dict.
+
+        The JSON array columns are still the stored TEXT here: they are
+        parsed on the dict path, or spliced verbatim as orjson.Fragment
+        on the raw path (written valid at write time, so no re-encode).
+        Scalar defaults are already applied by IFNULL/NULLIF in the
+        bundle's SELECT, so no `or` fallbacks are needed.
+        """
+        node = _NODE_TEMPLATE.copy()
+        node["id"] = row['id']
+        node["label"] = row['label']
+        node["x"] = row['x']
+        node["y"] = row['y']
+        node["type"] = row['type']
+        node["agentId"] = row['agent_id']
+        node["status"] = row['status']
+        node["lastEdited"] = row['last_edited']
+        node["summary"] = row['summary']
+        node["problem"] = row['problem']
+        if raw_json:
+            for field in _COMPONENT_JSON_FIELDS:
+                text = row[field]
+                node[field] = _Fragment(text) if text else _Fragment(b'[]')
+        else:
+            for field in _COMPONENT_JSON_FIELDS:
+                text = row[field]
+                node[field] = json.loads(text) if text else _EMPTY
+        node["metrics"] = metrics
+        node["testCases"] = test_cases
+        return node
 
-    def _serialize_component(self, comp) -> Dict[str, Any]:
+    def _serialize_component(self, comp: Component,
+                             metrics: Optional[List[Dict[str, Any]]] = None,
+                             test_cases: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Serialize a single component to Graph.html node format.
 
         Args:
             comp: Component model instance
+            metrics: Pre-shaped metric dicts for this component (queried
+                and shaped per-component when omitted)
+            test_cases: Pre-shaped test case dicts, same convention
 
         Returns:
             Dictionary in Graph.html node format
         """
-        # Get metrics and test cases
-        metrics = self.db.get_metrics(comp.id)
-        test_cases = self.db.get_test_cases(comp.id)
+        if metrics is None:
+            metrics = [
+                dict(zip(_METRIC_KEYS,
+                         (m.requirement, m.value or "TBD", m.status, m.weight)))
+                for m in self.db.get_metrics(comp.id)
+            ]
+        if test_cases is None:
+            test_cases = [
+                dict(zip(_TEST_CASE_KEYS,
+                         (tc.name, tc.status, tc.value, tc.weight)))
+                for tc in self.db.get_test_cases(comp.id)
+            ]
 
         return {
             "id": comp.id,
@@ -109,36 +237,155 @@ class GraphSerializer:
             "agentId": comp.agent_id,
             "status": comp.status or "pending",
             "lastEdited": comp.last_edited,
-            "summary": comp.summary or "",
-            "problem": comp.problem or "",
-            "goals": comp.goals or [],
-            "scope": comp.scope or [],
-            "requirements": comp.requirements or [],
-            "risks": comp.risks or [],
-            "inputs": comp.inputs or [],
-            "outputs": comp.outputs or [],
-            "files": comp.files or [],
-            "subtasks": comp.subtasks or [],
-            "metrics": [
-                {
-                    "req": m.requirement,
-                    "value": m.value or "TBD",
-                    "status": m.status,
-                    "weight": m.weight
-                }
-                for m in metrics
-            ],
-            "testCases": [
-                {
-                    "name": tc.name,
-                    "status": tc.status,
-                    "value": tc.value,
-                    "weight": tc.weight
-                }
-                for tc in test_cases
-            ]
+            "summary": comp.summary,
+            "problem": comp.problem,
+            "goals": comp.goals if comp.goals else _EMPTY,
+            "scope": comp.scope if comp.scope else _EMPTY,
+            "requirements": comp.requirements if comp.requirements else _EMPTY,
+            "risks": comp.risks if comp.risks else _EMPTY,
+            "inputs": comp.inputs if comp.inputs else _EMPTY,
+            "outputs": comp.outputs if comp.outputs else _EMPTY,
+            "files": comp.files if comp.files else _EMPTY,
+            "subtasks": comp.subtasks if comp.subtasks else _EMPTY,
+            "metrics": metrics,
+            "testCases": test_cases
         }
 
+    def serialize_project_json(self, project_id: str) -> Optional[bytes]:
+        """
+        Serialize a project straight to JSON bytes.
+
+        Avoids the dict -> str -> bytes double conversion at the HTTP
+        boundary; with orjson the encoder loop runs in C.
+
+        Args:
+            project_id: The project ID to serialize
+
+        Returns:
+            UTF-8 JSON bytes, or None if project not found
+        """
+        version = self.db.get_project_version(project_id)
+        if version is None:
+            return None
+
+        key = (project_id, version)
+        cached = self._json_cache.get(key)
+        if cached is not None:
+            self._json_cache.move_to_end(key)
+            return cached
+
+        payload = self._encode_project(project_id)
+        if payload is None:
+            return None
+        self._cache_put(project_id, key, payload)
+        return payload
+
+    def _encode_project(self, project_id: str) -> Optional[bytes]:
+        """
+        Encode a project payload to JSON bytes.
+
+        Prefers the fused SQL path (Database.get_project_graph_json), where
+        SQLite's json_object/json_group_array aggregates assemble the whole
+        document in one statement with no Python row iteration; falls back
+        to the Python builder on SQLite builds without JSON functions.
+        """
+        text = self.db.get_project_graph_json(project_id)
+        if text is not None:
+            return text.encode('utf-8')
+        data = self._build_project(project_id, raw_json=_Fragment is not None)
+        if data is None:
+            return None
+        return self._dumps(data)
+
+    def iter_project_json(self, project_id: str) -> Optional[Iterator[bytes]]:
+        """
+        Stream a project's Graph.html JSON as incremental byte fragments.
+
+        Serves the cached blob in one chunk when the version matches;
+        otherwise encodes node by node so the full JSON string is never
+        built before the first byte goes out. The fragments are collected
+        along the way to refill the version cache for the next poll.
+
+        Args:
+            project_id: The project ID to serialize
+
+        Returns:
+            Iterator of UTF-8 JSON fragments, or None if project not found
+        """
+        version = self.db.get_project_version(project_id)
+        if version is None:
+            return None
+
+        key = (project_id, version)
+        cached = self._json_cache.get(key)
+        if cached is not None:
+            self._json_cache.move_to_end(key)
+            return iter((cached,))
+
+        # The fused SQL path yields the whole document in one chunk; the
+        # node-by-node Python stream remains for SQLite builds without
+        # JSON functions.
+        text = self.db.get_project_graph_json(project_id)
+        if text is not None:
+            payload = text.encode('utf-8')
+            self._cache_put(project_id, key, payload)
+            return iter((payload,))
+        return self._stream_project_json(project_id, key)
+
+    def _stream_project_json(self, project_id: str,
+                             cache_key: Tuple[str, str]) -> Iterator[bytes]:
+        """Yield the project payload piecewise and cache the joined blob."""
+        bundle = self.db.get_project_bundle(project_id)
+        if not bundle:
+            return
+
+        project = bundle.project
+        raw_json = _Fragment is not None
+        metrics_by_comp = _group_rows(bundle.metrics)
+        tests_by_comp = _group_rows(bundle.test_cases)
+
+        head = self._dumps({
+            "projectId": project.id,
+            "projectName": project.name,
+            "projectSummary": project.summary,
+            "projectProblem": project.problem,
+            "phase": project.phase,
+            "globalTasks": bundle.global_tasks,
+            "agents": bundle.agents,
+        })
+        parts = [head[:-1] + b', "nodes": [']
+        yield parts[0]
+        for i, row in enumerate(bundle.components):
+            node = self._node_from_row(
+                row, metrics_by_comp.get(row['id'], []),
+                tests_by_comp.get(row['id'], []), raw_json
+            )
+            chunk = (b',' if i else b'') + self._dumps(node)
+            parts.append(chunk)
+            yield chunk
+        tail = (b'], "edges": ' + self._dumps(bundle.edges)
+                + b', "timestamp": ' + self._dumps(project.updated_at) + b'}')
+        parts.append(tail)
+        yield tail
+
+        self._cache_put(project_id, cache_key, b''.join(parts))
+
+    @staticmethod
+    def _dumps(data: Any) -> bytes:
+        """Encode to JSON bytes with orjson, or stdlib json when absent."""
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data).encode('utf-8')
+
+    def _cache_put(self, project_id: str, key: Tuple[str, str],
+                   payload: bytes) -> None:
+        """Store a serialized blob, evicting this project's stale versions."""
+        for stale in [k for k in self._json_cache if k[0] == project_id]:
+            del self._json_cache[stale]
+        self._json_cache[key] = payload
+        if len(self._json_cache) > self._JSON_CACHE_SIZE:
+            self._json_cache.popitem(last=False)
+
     def serialize_project_list(self) -> Dict[str, Any]:
         """
         Serialize all projects to a list format.
@@ -146,20 +393,8 @@ class GraphSerializer:
         Returns:
             Dictionary with projects array
         """
-        projects = self.db.get_all_projects()
-        return {
-            "projects": [
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "phase": p.phase,
-                    "summary": p.summary or "",
-                    "created_at": p.created_at,
-                    "updated_at": p.updated_at
-                }
-                for p in projects
-            ]
-        }
+        # Only the listed columns are fetched — no full Project models
+        return {"projects": self.db.list_projects_brief()}
 
     def serialize_component_detail(self, component_id: str) -> Optional[Dict[str, Any]]:
         """
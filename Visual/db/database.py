@@ -5,19 +5,206 @@ Provides SQLite connection and CRUD operations for all tables.
 import sqlite3
 import json
 import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 from .models import (
     Project, Component, Edge, Agent, Task, Log,
-    Manager, Metric, TestCase, GlobalTask, ChatMessage
+    Manager, Metric, TestCase, GlobalTask, ChatMessage,
+    _parse_json_list
 )
 
+# orjson encodes/decodes in C, several times faster than stdlib json on
+# the small list columns written here; fall back to stdlib if missing.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# json_object/json_group_array ship built-in from SQLite 3.38; older
+# builds fall back to assembling the payload in Python.
+_HAS_JSON_FUNCS = sqlite3.sqlite_version_info >= (3, 38)
+
+# JSON list columns are stored as compact text (no separator whitespace):
+# smaller rows, and the bytes can be spliced into responses verbatim.
+# Binary JSONB storage needs SQLite >= 3.45 and would break that verbatim
+# splicing, so it isn't used.
+_JSON_SEPARATORS = (',', ':')
+
+
+def _dump_json(value: Any) -> str:
+    """Serialize a JSON column value in the canonical compact form.
+
+    Stays TEXT (orjson's bytes are decoded) so the stored value keeps
+    working with the json()/NULLIF SQL paths and verbatim splicing.
+    """
+    if orjson is not None:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value, separators=_JSON_SEPARATORS)
+
+
+# orjson.JSONDecodeError subclasses ValueError, as does the stdlib's, so
+# callers catch ValueError around _load_json.
+_load_json = orjson.loads if orjson is not None else json.loads
+
+# Assembles the entire Graph.html payload inside SQLite: one statement,
+# one returned string, zero Python-level row iteration. Shapes and
+# defaults mirror the bundle SELECTs (NULLIF replicating the old
+# `x or default` fallbacks, stored JSON columns spliced via json()).
+_GRAPH_JSON_SQL = """
+SELECT json_object(
+  'projectId', p.id,
+  'projectName', p.name,
+  'projectSummary', IFNULL(p.summary, ''),
+  'projectProblem', IFNULL(p.problem, ''),
+  'phase', p.phase,
+  'globalTasks', (
+    SELECT json_group_array(json_object(
+             'text', text, 'done', json(IIF(done, 'true', 'false'))))
+    FROM (SELECT text, done FROM global_tasks
+          WHERE project_id = p.id ORDER BY sort_order)),
+  'agents', (
+    SELECT json_group_array(json_object(
+             'id', id, 'name', name, 'dept', IFNULL(dept, 'DEV'),
+             'initials', IFNULL(initials, ''), 'status', status))
+    FROM (SELECT * FROM agents
+          WHERE id IN (SELECT agent_id FROM components
+                       WHERE project_id = p.id AND agent_id IS NOT NULL)
+          ORDER BY id)),
+  'nodes', (
+    SELECT json_group_array(json_object(
+      'id', c.id,
+      'label', c.label,
+      'x', IFNULL(NULLIF(c.x, 0), 500),
+      'y', IFNULL(NULLIF(c.y, 0), 100),
+      'type', IFNULL(NULLIF(c.type, ''), 'node'),
+      'agentId', c.agent_id,
+      'status', IFNULL(NULLIF(c.status, ''), 'pending'),
+      'lastEdited', c.last_edited,
+      'summary', IFNULL(c.summary, ''),
+      'problem', IFNULL(c.problem, ''),
+      'goals', json(IFNULL(NULLIF(c.goals, ''), '[]')),
+      'scope', json(IFNULL(NULLIF(c.scope, ''), '[]')),
+      'requirements', json(IFNULL(NULLIF(c.requirements, ''), '[]')),
+      'risks', json(IFNULL(NULLIF(c.risks, ''), '[]')),
+      'inputs', json(IFNULL(NULLIF(c.inputs, ''), '[]')),
+      'outputs', json(IFNULL(NULLIF(c.outputs, ''), '[]')),
+      'files', json(IFNULL(NULLIF(c.files, ''), '[]')),
+      'subtasks', json(IFNULL(NULLIF(c.subtasks, ''), '[]')),
+      'metrics', (
+        SELECT json_group_array(json_object(
+                 'req', requirement, 'value', IFNULL(value, 'TBD'),
+                 'status', status, 'weight', weight))
+        FROM metrics m WHERE m.component_id = c.id),
+      'testCases', (
+        SELECT json_group_array(json_object(
+                 'name', name, 'status', status,
+                 'value', value, 'weight', weight))
+        FROM test_cases t WHERE t.component_id = c.id)))
+    FROM (SELECT * FROM components
+          WHERE project_id = p.id ORDER BY y, x) AS c),
+  'edges', (
+    SELECT json_group_array(json_object(
+             'from', from_id, 'to', to_id, 'label', IFNULL(label, ''),
+             'type', IFNULL(type, 'data')))
+    FROM edges e WHERE e.project_id = p.id),
+  'timestamp', p.updated_at
+)
+FROM projects p WHERE p.id = ?
+"""
+
+
+def _fixed_update_sql(table: str, cols: Tuple[str, ...]) -> str:
+    """
+    Build a fixed-shape UPDATE covering every updatable column.
+
+    Absent fields are bound as NULL and COALESCE keeps the current value,
+    so one constant SQL string (one cached prepared statement) serves
+    every combination of updated fields instead of one string per field
+    permutation.
+    """
+    sets = ", ".join(f"{c} = COALESCE(?, {c})" for c in cols)
+    return f"UPDATE {table} SET {sets} WHERE id = ? RETURNING *"
+
+
+_PROJECT_UPDATE_COLS = (
+    'name', 'phase', 'summary', 'problem', 'transcript', 'work_plan',
+    'questions'
+)
+_PROJECT_UPDATE_SQL = _fixed_update_sql('projects', _PROJECT_UPDATE_COLS)
+
+_COMPONENT_UPDATE_COLS = (
+    'parent_id', 'label', 'type', 'status', 'x', 'y', 'summary', 'problem',
+    'goals', 'scope', 'requirements', 'risks', 'inputs', 'outputs',
+    'files', 'subtasks', 'agent_id'
+)
+_COMPONENT_UPDATE_SQL = _fixed_update_sql('components', _COMPONENT_UPDATE_COLS)
+
+# Component columns stored as JSON array text
+_COMPONENT_JSON_FIELDS = frozenset(
+    ('goals', 'scope', 'requirements', 'risks',
+     'inputs', 'outputs', 'files', 'subtasks')
+)
+
+_COMPONENT_INSERT_SQL = """INSERT INTO components
+       (id, project_id, parent_id, label, type, status, x, y,
+        summary, problem, goals, scope, requirements, risks,
+        inputs, outputs, files, subtasks, agent_id)
+       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+       ON CONFLICT(id) DO UPDATE SET """ + ", ".join(
+    f"{c} = excluded.{c}"
+    for c in ('project_id',) + _COMPONENT_UPDATE_COLS
+) + " RETURNING *"
+
+_AGENT_UPDATE_COLS = (
+    'name', 'dept', 'initials', 'manager_id', 'task_id', 'status',
+    'last_active'
+)
+_AGENT_UPDATE_SQL = _fixed_update_sql('agents', _AGENT_UPDATE_COLS)
+
+_TASK_UPDATE_COLS = (
+    'manager_id', 'title', 'description', 'logic', 'status', 'priority',
+    'assigned_agent', 'completed_at'
+)
+_TASK_UPDATE_SQL = _fixed_update_sql('tasks', _TASK_UPDATE_COLS)
+
+
+@dataclass
+class ProjectBundle:
+    """
+    Everything needed to serialize one project, fetched on one connection.
+
+    Components are raw row dicts — their JSON list columns (goals, scope,
+    ...) are still the stored TEXT so the serializer can either parse them
+    or splice them into the output verbatim. The other collections are
+    already Graph.html-shaped dicts produced by aliased SELECTs and the
+    C-level sqlite3.Row -> dict conversion. Metric and test-case dicts
+    carry a 'component_id' key for grouping.
+    """
+    project: Project
+    components: List[Dict[str, Any]]
+    edges: List[Dict[str, Any]]
+    global_tasks: List[Dict[str, Any]]
+    agents: List[Dict[str, Any]]
+    metrics: List[Dict[str, Any]]
+    test_cases: List[Dict[str, Any]]
+
 
 class Database:
     """SQLite database interface for the orchestrator."""
 
+    # Shared pool for overlapping independent reads: WAL mode allows any
+    # number of concurrent readers, and each submitted fetch opens its own
+    # connection, so bundle latency approaches max(query) not sum(queries).
+    # Threads are only spawned on first use.
+    _read_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='db-read')
+
     def __init__(self, db_path: str = None):
         """
         Initialize database connection.
@@ -28,36 +215,160 @@ class Database:
         """
         if db_path is None:
             db_path = os.path.join(os.path.dirname(__file__), '..', 'orchestrator.db')
-        self.db_path = os.path.abspath(db_path)
+        # URI paths (e.g. file::memory:?cache=shared for tests) pass
+        # through untouched; abspath would mangle them into file names.
+        if db_path.startswith('file:'):
+            self.db_path = db_path
+        else:
+            self.db_path = os.path.abspath(db_path)
+        # Short-TTL cache for project rows: a list request followed by a
+        # detail request (the UI's list-then-open pattern) shares one
+        # fetch. Any project write clears it; entries also expire on
+        # their own so other writers can't leave it stale for long.
+        self._project_cache: Dict[Any, Any] = {}
+        # Built graph dicts memoized per project, keyed by the version
+        # probe (see get_project_version); one entry per project.
+        self._graph_cache: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        # Near-static agent rows cached by id; every agent write path
+        # refreshes or evicts its entry (see get_agent).
+        self._agent_cache: Dict[str, Agent] = {}
+        # Bumped by every agent write so callers can gate a cached
+        # agent-list payload without querying (see get_agents_version).
+        self._agents_version = 0
+        # Log writes are enqueued and flushed in batches by a background
+        # thread (started on first create_log), turning one fsync per log
+        # entry into one per flush. See create_log/_flush_logs.
+        self._log_queue: 'queue.Queue[Tuple]' = queue.Queue()
+        self._log_event = threading.Event()
+        self._log_flush_lock = threading.Lock()
+        self._log_writer_started = False
+        # One persistent connection per thread (request handler, read-pool
+        # workers): opened and tuned once, reused for every call after.
+        self._local = threading.local()
         self._init_db()
 
+    # Bump whenever schema.sql changes so existing databases re-run it
+    # (the script is idempotent: IF NOT EXISTS / DROP IF EXISTS).
+    _SCHEMA_VERSION = 3
+
     def _init_db(self):
-        """Initialize database with schema."""
+        """Initialize database with schema (skipped when already current)."""
+        conn = self._get_conn()
+        if conn.execute("PRAGMA user_version").fetchone()[0] == self._SCHEMA_VERSION:
+            return
         schema_path = os.path.join(os.path.dirname(__file__), 'schema.sql')
         with open(schema_path, 'r') as f:
             schema = f.read()
-        with self.connection() as conn:
-            conn.executescript(schema)
+        # executescript manages its own transaction (it commits any open
+        # one first), so run it on the raw connection rather than inside
+        # the connection() BEGIN/COMMIT bracket.
+        conn.executescript(schema)
+        conn.execute(f"PRAGMA user_version = {self._SCHEMA_VERSION}")
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get (or lazily open and tune) this thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # cached_statements keeps prepared statements across execute()
+            # calls, so repeated SQL text skips the parse/plan step.
+            # isolation_level=None leaves transaction control to
+            # connection(), which brackets work in explicit BEGIN/COMMIT.
+            conn = sqlite3.connect(
+                self.db_path, isolation_level=None, cached_statements=256,
+                uri=self.db_path.startswith('file:')
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys = ON")
+            # One-time tuning, amortized over the connection's lifetime:
+            # WAL lets writers append instead of taking the rollback-journal
+            # fsync barrier (and never blocks readers), NORMAL is durable
+            # enough under WAL, mmap serves reads without read() syscalls,
+            # and the larger cache plus in-memory temp store keep the
+            # serializer's read bursts off disk.
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA mmap_size = 268435456")
+            conn.execute("PRAGMA cache_size = -65536")
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA busy_timeout = 5000")
+            # Cap the WAL file so checkpoints truncate it back instead of
+            # letting a long-lived server grow it unboundedly.
+            conn.execute("PRAGMA journal_size_limit = 6144000")
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
 
     @contextmanager
     def connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
+        """
+        Context manager for database access.
+
+        Yields this thread's persistent connection inside an explicit
+        transaction (committed on success, rolled back on error). Nested
+        uses on the same thread join the outer transaction.
+        """
+        conn = self._get_conn()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+        self._local.depth = 1
+        conn.execute("BEGIN")
         try:
             yield conn
-            conn.commit()
+            conn.execute("COMMIT")
         except Exception:
-            conn.rollback()
+            conn.execute("ROLLBACK")
             raise
         finally:
-            conn.close()
+            self._local.depth = 0
 
     # =========================================================================
     # PROJECT OPERATIONS
     # =========================================================================
 
+    # Lifetime of cached project rows, in seconds
+    _PROJECT_CACHE_TTL = 1.0
+
+    def _project_cache_get(self, key: Any) -> Any:
+        """Return a cached project read, or None if absent/expired."""
+        hit = self._project_cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < self._PROJECT_CACHE_TTL:
+            return hit[1]
+        return None
+
+    def _project_cache_set(self, key: Any, value: Any) -> Any:
+        self._project_cache[key] = (time.monotonic(), value)
+        return value
+
+    def _invalidate_projects(self) -> None:
+        self._project_cache.clear()
+
+    def _execute_update(self, sql: str, cols: Tuple[str, ...],
+                        filtered: Dict[str, Any], id: Any) -> Optional[sqlite3.Row]:
+        """
+        Run one of the fixed-shape _UPDATE_*_SQL statements.
+
+        The SQL text is constant per table (every updatable column set via
+        COALESCE(?, column), absent keys bound as NULL), so every update
+        against a table reuses one cached prepared statement regardless of
+        which fields the caller passed. Consequence: an explicit None in
+        updates is indistinguishable from "absent" and leaves the column
+        unchanged — no caller sets a column to NULL through these methods.
+
+        Returns the updated row via RETURNING (one statement instead of
+        UPDATE + re-SELECT), or None if no row matched. Note the returned
+        timestamp columns predate the AFTER UPDATE triggers that bump
+        updated_at/last_edited; nothing reads them off the return value.
+        """
+        values = [filtered.get(c) for c in cols]
+        values.append(id)
+        with self.connection() as conn:
+            return conn.execute(sql, values).fetchone()
+
     def create_project(
         self,
         id: str,
@@ -67,31 +378,64 @@ class Database:
         problem: str = None,
         questions: List[str] = None
     ) -> Project:
-        """Create a new project (or replace if exists)."""
+        """Create a new project (upserts in place if the id exists)."""
         with self.connection() as conn:
-            conn.execute(
-                """INSERT OR REPLACE INTO projects 
+            row = conn.execute(
+                """INSERT INTO projects
                    (id, name, phase, summary, problem, questions)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (id, name, phase, summary, problem, json.dumps(questions or []))
-            )
-        return self.get_project(id)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET
+                       name = excluded.name,
+                       phase = excluded.phase,
+                       summary = excluded.summary,
+                       problem = excluded.problem,
+                       questions = excluded.questions
+                   RETURNING *""",
+                (id, name, phase, summary, problem, _dump_json(questions or []))
+            ).fetchone()
+        self._invalidate_projects()
+        return self._project_cache_set(('project', id), self._row_to_project(row))
 
     def get_project(self, id: str) -> Optional[Project]:
-        """Get a project by ID."""
+        """Get a project by ID (cached briefly, see _PROJECT_CACHE_TTL)."""
+        cached = self._project_cache_get(('project', id))
+        if cached is not None:
+            return cached
         with self.connection() as conn:
             row = conn.execute(
                 "SELECT * FROM projects WHERE id = ?", (id,)
             ).fetchone()
             if row:
-                return self._row_to_project(row)
+                return self._project_cache_set(('project', id), self._row_to_project(row))
         return None
 
     def get_all_projects(self) -> List[Project]:
-        """Get all projects."""
+        """Get all projects (cached briefly, see _PROJECT_CACHE_TTL)."""
+        cached = self._project_cache_get('all')
+        if cached is not None:
+            return cached
         with self.connection() as conn:
             rows = conn.execute("SELECT * FROM projects ORDER BY created_at DESC").fetchall()
-            return [self._row_to_project(row) for row in rows]
+            return self._project_cache_set('all', [self._row_to_project(row) for row in rows])
+
+    def list_projects_brief(self) -> List[Dict[str, Any]]:
+        """
+        List all projects with only the summary-view columns.
+
+        Skips the heavy columns (transcript, work_plan, questions) and the
+        Project model construction entirely; rows come back as dicts in
+        the list-endpoint output shape.
+        """
+        cached = self._project_cache_get('brief')
+        if cached is not None:
+            return cached
+        with self.connection() as conn:
+            rows = conn.execute(
+                """SELECT id, name, phase, IFNULL(summary, '') AS summary,
+                          created_at, updated_at
+                   FROM projects ORDER BY created_at DESC"""
+            ).fetchall()
+            return self._project_cache_set('brief', [dict(row) for row in rows])
 
     def _row_to_project(self, row: sqlite3.Row) -> Project:
         """Convert a database row to a Project object."""
@@ -99,8 +443,8 @@ class Database:
         # Parse JSON fields
         if data.get('questions'):
             try:
-                data['questions'] = json.loads(data['questions'])
-            except json.JSONDecodeError:
+                data['questions'] = _load_json(data['questions'])
+            except ValueError:
                 data['questions'] = []
         else:
             data['questions'] = []
@@ -108,26 +452,74 @@ class Database:
 
     def update_project(self, id: str, updates: Dict[str, Any]) -> Optional[Project]:
         """Update a project."""
-        allowed = {'name', 'phase', 'summary', 'problem', 'transcript', 'work_plan', 'questions'}
-        filtered = {k: v for k, v in updates.items() if k in allowed}
+        filtered = {k: v for k, v in updates.items() if k in _PROJECT_UPDATE_COLS}
         if not filtered:
             return self.get_project(id)
 
         # Serialize JSON fields
         if 'questions' in filtered:
-            filtered['questions'] = json.dumps(filtered['questions'])
+            filtered['questions'] = _dump_json(filtered['questions'])
 
-        set_clause = ", ".join(f"{k} = ?" for k in filtered.keys())
-        values = list(filtered.values()) + [id]
+        row = self._execute_update(
+            _PROJECT_UPDATE_SQL, _PROJECT_UPDATE_COLS, filtered, id)
+        self._invalidate_projects()
+        return self._row_to_project(row) if row else None
+
+    def get_project_version(self, id: str) -> Optional[str]:
+        """
+        Get a cheap change marker for a project's graph data.
 
+        Component edits only bump components.last_edited (not the project's
+        updated_at), so the marker folds in per-table counts/timestamps for
+        everything that feeds the serialized graph. Any create, update or
+        delete through this class changes the marker.
+
+        Returns:
+            An opaque version string, or None if the project does not exist
+        """
         with self.connection() as conn:
-            conn.execute(f"UPDATE projects SET {set_clause} WHERE id = ?", values)
-        return self.get_project(id)
+            row = conn.execute(
+                """SELECT p.updated_at
+                     || '|' || (SELECT COUNT(*) || ':' || IFNULL(MAX(last_edited), '')
+                                FROM components c WHERE c.project_id = p.id)
+                     || '|' || (SELECT COUNT(*) || ':' || IFNULL(MAX(id), 0)
+                                FROM edges e WHERE e.project_id = p.id)
+                     || '|' || (SELECT COUNT(*) || ':' || IFNULL(SUM(done), 0)
+                                FROM global_tasks g WHERE g.project_id = p.id)
+                     || '|' || (SELECT COUNT(*) || ':' || IFNULL(GROUP_CONCAT(m.status), '')
+                                FROM metrics m JOIN components c ON m.component_id = c.id
+                                WHERE c.project_id = p.id)
+                     || '|' || (SELECT COUNT(*) || ':' || IFNULL(GROUP_CONCAT(t.status), '')
+                                FROM test_cases t JOIN components c ON t.component_id = c.id
+                                WHERE c.project_id = p.id)
+                     || '|' || (SELECT IFNULL(GROUP_CONCAT(a.status), '')
+                                FROM agents a WHERE a.id IN
+                                (SELECT agent_id FROM components c
+                                 WHERE c.project_id = p.id AND agent_id IS NOT NULL))
+                   FROM projects p WHERE p.id = ?""",
+                (id,)
+            ).fetchone()
+            return row[0] if row else None
+
+    def get_projects_version(self) -> str:
+        """
+        Get a cheap change marker for the projects listing.
+
+        Folds row count and the latest updated_at into one string; any
+        project create, update or delete changes it, so callers can gate
+        a cached /api/projects payload on it instead of re-reading and
+        re-serializing every row.
+        """
+        row = self._get_conn().execute(
+            "SELECT COUNT(*) || '|' || IFNULL(MAX(updated_at), '') FROM projects"
+        ).fetchone()
+        return row[0]
 
     def delete_project(self, id: str) -> bool:
         """Delete a project and all related data."""
         with self.connection() as conn:
             cursor = conn.execute("DELETE FROM projects WHERE id = ?", (id,))
+            self._invalidate_projects()
             return cursor.rowcount > 0
 
     # =========================================================================
@@ -156,33 +548,43 @@ class Database:
         subtasks: List[Dict] = None,
         agent_id: str = None
     ) -> Component:
-        """Create a new component (or replace if exists)."""
+        """Create a new component (upserts in place if the id exists)."""
         if not id:
             import uuid
             id = f"comp_{uuid.uuid4().hex[:8]}"
 
         with self.connection() as conn:
-            conn.execute(
-                """INSERT OR REPLACE INTO components
-                   (id, project_id, parent_id, label, type, status, x, y,
-                    summary, problem, goals, scope, requirements, risks,
-                    inputs, outputs, files, subtasks, agent_id)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            row = conn.execute(
+                _COMPONENT_INSERT_SQL,
                 (
                     id, project_id, parent_id, label, type, status, x, y,
                     summary, problem,
-                    json.dumps(goals or []),
-                    json.dumps(scope or []),
-                    json.dumps(requirements or []),
-                    json.dumps(risks or []),
-                    json.dumps(inputs or []),
-                    json.dumps(outputs or []),
-                    json.dumps(files or []),
-                    json.dumps(subtasks or []),
+                    _dump_json(goals or []),
+                    _dump_json(scope or []),
+                    _dump_json(requirements or []),
+                    _dump_json(risks or []),
+                    _dump_json(inputs or []),
+                    _dump_json(outputs or []),
+                    _dump_json(files or []),
+                    _dump_json(subtasks or []),
                     agent_id
                 )
-            )
-        return self.get_component(id)
+            ).fetchone()
+        return self._row_to_component(row)
+
+    def get_component_version(self, id: str) -> Optional[str]:
+        """
+        Get a cheap change marker for one component.
+
+        Returns the row's last_edited stamp (a trigger bumps it on every
+        component write), or None if the component does not exist, so
+        callers can gate a cached detail payload on it instead of
+        re-reading and re-serializing the component.
+        """
+        row = self._get_conn().execute(
+            "SELECT last_edited FROM components WHERE id = ?", (id,)
+        ).fetchone()
+        return row[0] if row else None
 
     def get_component(self, id: str) -> Optional[Component]:
         """Get a component by ID."""
@@ -204,44 +606,22 @@ class Database:
             return [self._row_to_component(row) for row in rows]
 
     def _row_to_component(self, row: sqlite3.Row) -> Component:
-        """Convert a database row to a Component object."""
-        data = dict(row)
-        # Parse JSON fields
-        for field in ['goals', 'scope', 'requirements', 'risks', 'inputs',
-                      'outputs', 'files', 'subtasks']:
-            if data.get(field):
-                try:
-                    data[field] = json.loads(data[field])
-                except json.JSONDecodeError:
-                    data[field] = []
-            else:
-                data[field] = []
-        return Component(**data)
+        """Convert a database row (schema column order) to a Component."""
+        return Component._from_row(*row)
 
     def update_component(self, id: str, updates: Dict[str, Any]) -> Optional[Component]:
         """Update a component."""
-        allowed = {
-            'parent_id', 'label', 'type', 'status', 'x', 'y',
-            'summary', 'problem', 'goals', 'scope', 'requirements', 'risks',
-            'inputs', 'outputs', 'files', 'subtasks', 'agent_id'
-        }
-        filtered = {k: v for k, v in updates.items() if k in allowed}
+        filtered = {k: v for k, v in updates.items() if k in _COMPONENT_UPDATE_COLS}
         if not filtered:
             return self.get_component(id)
 
         # Serialize JSON fields
-        json_fields = {'goals', 'scope', 'requirements', 'risks',
-                       'inputs', 'outputs', 'files', 'subtasks'}
-        for field in json_fields:
-            if field in filtered:
-                filtered[field] = json.dumps(filtered[field])
+        for field in _COMPONENT_JSON_FIELDS & filtered.keys():
+            filtered[field] = _dump_json(filtered[field])
 
-        set_clause = ", ".join(f"{k} = ?" for k in filtered.keys())
-        values = list(filtered.values()) + [id]
-
-        with self.connection() as conn:
-            conn.execute(f"UPDATE components SET {set_clause} WHERE id = ?", values)
-        return self.get_component(id)
+        row = self._execute_update(
+            _COMPONENT_UPDATE_SQL, _COMPONENT_UPDATE_COLS, filtered, id)
+        return self._row_to_component(row) if row else None
 
     def delete_component(self, id: str) -> bool:
         """Delete a component."""
@@ -278,20 +658,34 @@ class Database:
             type=type
         )
 
+    def create_edges(
+        self,
+        project_id: str,
+        edges: List[Tuple[str, str, str, str]]
+    ) -> int:
+        """Create many edges in one transaction.
+
+        Each tuple is (from_id, to_id, label, type). Uses executemany so
+        the statement is compiled once and all rows share a single commit.
+        Returns the number of edges inserted.
+        """
+        if not edges:
+            return 0
+        with self.connection() as conn:
+            cursor = conn.executemany(
+                """INSERT INTO edges (project_id, from_id, to_id, label, type)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(project_id, f, t, label, type_) for f, t, label, type_ in edges]
+            )
+            return cursor.rowcount
+
     def get_edges_by_project(self, project_id: str) -> List[Edge]:
         """Get all edges for a project."""
         with self.connection() as conn:
             rows = conn.execute(
                 "SELECT * FROM edges WHERE project_id = ?", (project_id,)
             ).fetchall()
-            return [Edge(
-                id=row['id'],
-                project_id=row['project_id'],
-                from_id=row['from_id'],
-                to_id=row['to_id'],
-                label=row['label'],
-                type=row['type']
-            ) for row in rows]
+            return [Edge._from_row(*row) for row in rows]
 
     def delete_edge(self, id: int) -> bool:
         """Delete an edge."""
@@ -320,25 +714,57 @@ class Database:
         manager_id: str = None,
         status: str = 'idle'
     ) -> Agent:
-        """Create a new agent (or replace if exists)."""
-        if initials is None:
-            initials = name[:2].upper()
+        """Create a new agent (upserts in place if the id exists)."""
+        # Persist display initials at write time so reads are a pure fetch
+        initials = (initials or name[:2]).upper()
         with self.connection() as conn:
-            conn.execute(
-                """INSERT OR REPLACE INTO agents (id, name, dept, initials, manager_id, status)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
+            row = conn.execute(
+                """INSERT INTO agents (id, name, dept, initials, manager_id, status)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET
+                       name = excluded.name,
+                       dept = excluded.dept,
+                       initials = excluded.initials,
+                       manager_id = excluded.manager_id,
+                       status = excluded.status
+                   RETURNING *""",
                 (id, name, dept, initials, manager_id, status)
-            )
-        return self.get_agent(id)
+            ).fetchone()
+        agent = Agent._from_row(*row)
+        self._agent_cache[id] = agent
+        self._agents_version += 1
+        return agent
+
+    def get_agents_version(self) -> int:
+        """
+        Get a cheap change marker for the agent catalog.
+
+        An in-process counter bumped by every agent write; the agents
+        table has no updated_at column to probe, and the server and
+        Database share one process, so the counter is authoritative.
+        """
+        return self._agents_version
 
     def get_agent(self, id: str) -> Optional[Agent]:
-        """Get an agent by ID."""
+        """
+        Get an agent by ID.
+
+        Served from the in-process agent cache when possible — agents
+        change far less often than they are read, and every write path
+        here refreshes or evicts its entry. Callers treat the returned
+        Agent as read-only.
+        """
+        agent = self._agent_cache.get(id)
+        if agent is not None:
+            return agent
         with self.connection() as conn:
             row = conn.execute(
                 "SELECT * FROM agents WHERE id = ?", (id,)
             ).fetchone()
             if row:
-                return Agent(**dict(row))
+                agent = Agent._from_row(*row)
+                self._agent_cache[id] = agent
+                return agent
         return None
 
     def get_agents_by_manager(self, manager_id: str) -> List[Agent]:
@@ -347,30 +773,40 @@ class Database:
             rows = conn.execute(
                 "SELECT * FROM agents WHERE manager_id = ?", (manager_id,)
             ).fetchall()
-            return [Agent(**dict(row)) for row in rows]
+            return [Agent._from_row(*row) for row in rows]
 
     def get_all_agents(self) -> List[Agent]:
-        """Get all agents."""
+        """Get all agents (repopulates the agent cache in one query)."""
         with self.connection() as conn:
             rows = conn.execute("SELECT * FROM agents").fetchall()
-            return [Agent(**dict(row)) for row in rows]
+            agents = [Agent._from_row(*row) for row in rows]
+        self._agent_cache = {a.id: a for a in agents}
+        return agents
 
     def update_agent(self, id: str, updates: Dict[str, Any]) -> Optional[Agent]:
         """Update an agent."""
-        allowed = {'name', 'dept', 'initials', 'manager_id', 'task_id', 'status', 'last_active'}
-        filtered = {k: v for k, v in updates.items() if k in allowed}
+        filtered = {k: v for k, v in updates.items() if k in _AGENT_UPDATE_COLS}
         if not filtered:
             return self.get_agent(id)
 
-        set_clause = ", ".join(f"{k} = ?" for k in filtered.keys())
-        values = list(filtered.values()) + [id]
+        # Keep stored initials normalized (see create_agent)
+        if filtered.get('initials'):
+            filtered['initials'] = filtered['initials'].upper()
 
-        with self.connection() as conn:
-            conn.execute(f"UPDATE agents SET {set_clause} WHERE id = ?", values)
-        return self.get_agent(id)
+        row = self._execute_update(
+            _AGENT_UPDATE_SQL, _AGENT_UPDATE_COLS, filtered, id)
+        if row is None:
+            self._agent_cache.pop(id, None)
+            return None
+        agent = Agent._from_row(*row)
+        self._agent_cache[id] = agent
+        self._agents_version += 1
+        return agent
 
     def delete_agent(self, id: str) -> bool:
         """Delete an agent."""
+        self._agent_cache.pop(id, None)
+        self._agents_version += 1
         with self.connection() as conn:
             cursor = conn.execute("DELETE FROM agents WHERE id = ?", (id,))
             return cursor.rowcount > 0
@@ -393,16 +829,16 @@ class Database:
     ) -> Task:
         """Create a new task."""
         with self.connection() as conn:
-            cursor = conn.execute(
+            row = conn.execute(
                 """INSERT INTO tasks
                    (component_id, manager_id, title, description, logic,
                     status, priority, assigned_agent, created_by)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   RETURNING *""",
                 (component_id, manager_id, title, description, logic,
                  status, priority, assigned_agent, created_by)
-            )
-            task_id = cursor.lastrowid
-        return self.get_task(task_id)
+            ).fetchone()
+        return Task._from_row(*row)
 
     def get_task(self, id: int) -> Optional[Task]:
         """Get a task by ID."""
@@ -411,7 +847,7 @@ class Database:
                 "SELECT * FROM tasks WHERE id = ?", (id,)
             ).fetchone()
             if row:
-                return Task(**dict(row))
+                return Task._from_row(*row)
         return None
 
     def get_tasks_by_component(self, component_id: str) -> List[Task]:
@@ -421,7 +857,7 @@ class Database:
                 "SELECT * FROM tasks WHERE component_id = ? ORDER BY priority DESC, id",
                 (component_id,)
             ).fetchall()
-            return [Task(**dict(row)) for row in rows]
+            return [Task._from_row(*row) for row in rows]
 
     def get_tasks_by_manager(self, manager_id: str) -> List[Task]:
         """Get all tasks for a manager."""
@@ -430,24 +866,17 @@ class Database:
                 "SELECT * FROM tasks WHERE manager_id = ? ORDER BY priority DESC, id",
                 (manager_id,)
             ).fetchall()
-            return [Task(**dict(row)) for row in rows]
+            return [Task._from_row(*row) for row in rows]
 
     def update_task(self, id: int, updates: Dict[str, Any]) -> Optional[Task]:
         """Update a task."""
-        allowed = {
-            'manager_id', 'title', 'description', 'logic', 'status',
-            'priority', 'assigned_agent', 'completed_at'
-        }
-        filtered = {k: v for k, v in updates.items() if k in allowed}
+        filtered = {k: v for k, v in updates.items() if k in _TASK_UPDATE_COLS}
         if not filtered:
             return self.get_task(id)
 
-        set_clause = ", ".join(f"{k} = ?" for k in filtered.keys())
-        values = list(filtered.values()) + [id]
-
-        with self.connection() as conn:
-            conn.execute(f"UPDATE tasks SET {set_clause} WHERE id = ?", values)
-        return self.get_task(id)
+        row = self._execute_update(
+            _TASK_UPDATE_SQL, _TASK_UPDATE_COLS, filtered, id)
+        return Task._from_row(*row) if row else None
 
     def delete_task(self, id: int) -> bool:
         """Delete a task."""
@@ -469,17 +898,25 @@ class Database:
         agent_id: str = None,
         level: str = 'info'
     ) -> Log:
-        """Create a new log entry."""
-        with self.connection() as conn:
-            cursor = conn.execute(
-                """INSERT INTO logs
-                   (project_id, component_id, task_id, agent_id, action, message, level)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (project_id, component_id, task_id, agent_id, action, message, level)
-            )
-            log_id = cursor.lastrowid
+        """
+        Create a new log entry.
+
+        Enqueues the row for the background flusher instead of committing
+        (and fsyncing) per entry; the returned Log carries the timestamp
+        that will be stored but no id. Log readers flush first, so
+        read-your-writes still holds.
+        """
+        # Same shape as CURRENT_TIMESTAMP (UTC, second precision)
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+        self._log_queue.put(
+            (project_id, component_id, task_id, agent_id,
+             action, message, level, timestamp)
+        )
+        if not self._log_writer_started:
+            self._start_log_writer()
+        self._log_event.set()
         return Log(
-            id=log_id,
+            id=None,
             project_id=project_id,
             component_id=component_id,
             task_id=task_id,
@@ -487,28 +924,89 @@ class Database:
             action=action,
             message=message,
             level=level,
-            timestamp=datetime.now().isoformat()
+            timestamp=timestamp
+        )
+
+    # How long the flusher waits after the first queued entry to coalesce
+    # a burst, and how many entries one transaction writes at most.
+    _LOG_FLUSH_DELAY = 0.05
+    _LOG_FLUSH_BATCH = 256
+
+    def _start_log_writer(self) -> None:
+        """Start the daemon flusher thread (once)."""
+        with self._log_flush_lock:
+            if self._log_writer_started:
+                return
+            self._log_writer_started = True
+        threading.Thread(
+            target=self._log_writer_loop, name='db-log-writer', daemon=True
+        ).start()
+
+    def _log_writer_loop(self) -> None:
+        while True:
+            self._log_event.wait()
+            self._log_event.clear()
+            time.sleep(self._LOG_FLUSH_DELAY)
+            self._flush_logs()
+
+    def _flush_logs(self) -> None:
+        """Drain queued log entries into the database in batched commits."""
+        with self._log_flush_lock:
+            while True:
+                batch = []
+                while len(batch) < self._LOG_FLUSH_BATCH:
+                    try:
+                        batch.append(self._log_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return
+                with self.connection() as conn:
+                    conn.executemany(
+                        """INSERT INTO logs
+                           (project_id, component_id, task_id, agent_id,
+                            action, message, level, timestamp)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                        batch
+                    )
+
+    def iter_logs_by_project(self, project_id: str, limit: int = 100) -> Iterator[Log]:
+        """
+        Yield logs for a project, newest first.
+
+        Streams straight off the cursor instead of materializing the row
+        list, so callers that stop early never pay for the rest. Runs in
+        autocommit on this thread's connection (WAL reads need no
+        transaction bracket), so abandoning the generator mid-iteration
+        leaves nothing open.
+        """
+        self._flush_logs()
+        cursor = self._get_conn().execute(
+            """SELECT * FROM logs WHERE project_id = ?
+               ORDER BY timestamp DESC LIMIT ?""",
+            (project_id, limit)
         )
+        for row in cursor:
+            yield Log._from_row(*row)
 
     def get_logs_by_project(self, project_id: str, limit: int = 100) -> List[Log]:
         """Get logs for a project."""
-        with self.connection() as conn:
-            rows = conn.execute(
-                """SELECT * FROM logs WHERE project_id = ?
-                   ORDER BY timestamp DESC LIMIT ?""",
-                (project_id, limit)
-            ).fetchall()
-            return [Log(**dict(row)) for row in rows]
+        return list(self.iter_logs_by_project(project_id, limit))
+
+    def iter_logs_by_agent(self, agent_id: str, limit: int = 100) -> Iterator[Log]:
+        """Yield logs for an agent, newest first (see iter_logs_by_project)."""
+        self._flush_logs()
+        cursor = self._get_conn().execute(
+            """SELECT * FROM logs WHERE agent_id = ?
+               ORDER BY timestamp DESC LIMIT ?""",
+            (agent_id, limit)
+        )
+        for row in cursor:
+            yield Log._from_row(*row)
 
     def get_logs_by_agent(self, agent_id: str, limit: int = 100) -> List[Log]:
         """Get logs for an agent."""
-        with self.connection() as conn:
-            rows = conn.execute(
-                """SELECT * FROM logs WHERE agent_id = ?
-                   ORDER BY timestamp DESC LIMIT ?""",
-                (agent_id, limit)
-            ).fetchall()
-            return [Log(**dict(row)) for row in rows]
+        return list(self.iter_logs_by_agent(agent_id, limit))
 
     # =========================================================================
     # MANAGER OPERATIONS
@@ -522,14 +1020,20 @@ class Database:
         status: str = 'active',
         created_by: str = None
     ) -> Manager:
-        """Create a new manager (or replace if exists)."""
+        """Create a new manager (upserts in place if the id exists)."""
         with self.connection() as conn:
-            conn.execute(
-                """INSERT OR REPLACE INTO managers (id, project_id, component_id, status, created_by)
-                   VALUES (?, ?, ?, ?, ?)""",
+            row = conn.execute(
+                """INSERT INTO managers (id, project_id, component_id, status, created_by)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET
+                       project_id = excluded.project_id,
+                       component_id = excluded.component_id,
+                       status = excluded.status,
+                       created_by = excluded.created_by
+                   RETURNING *""",
                 (id, project_id, component_id, status, created_by)
-            )
-        return self.get_manager(id)
+            ).fetchone()
+        return Manager(**dict(row))
 
     def get_manager(self, id: str) -> Optional[Manager]:
         """Get a manager by ID."""
@@ -578,13 +1082,45 @@ class Database:
             weight=weight
         )
 
+    def create_metrics(
+        self,
+        component_id: str,
+        metrics: List[Tuple[str, Optional[str], str, float]]
+    ) -> int:
+        """Create many metrics for a component in one transaction.
+
+        Each tuple is (requirement, value, status, weight). Returns the
+        number of metrics inserted.
+        """
+        if not metrics:
+            return 0
+        with self.connection() as conn:
+            cursor = conn.executemany(
+                """INSERT INTO metrics (component_id, requirement, value, status, weight)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(component_id, req, value, status, weight)
+                 for req, value, status, weight in metrics]
+            )
+            return cursor.rowcount
+
     def get_metrics_by_component(self, component_id: str) -> List[Metric]:
         """Get all metrics for a component."""
         with self.connection() as conn:
             rows = conn.execute(
                 "SELECT * FROM metrics WHERE component_id = ?", (component_id,)
             ).fetchall()
-            return [Metric(**dict(row)) for row in rows]
+            return [Metric._from_row(*row) for row in rows]
+
+    def get_metrics_for_project(self, project_id: str) -> List[Metric]:
+        """Get metrics for all components of a project in one query."""
+        with self.connection() as conn:
+            rows = conn.execute(
+                """SELECT m.* FROM metrics m
+                   JOIN components c ON m.component_id = c.id
+                   WHERE c.project_id = ?""",
+                (project_id,)
+            ).fetchall()
+            return [Metric._from_row(*row) for row in rows]
 
     # =========================================================================
     # TEST CASE OPERATIONS
@@ -615,13 +1151,45 @@ class Database:
             weight=weight
         )
 
+    def create_test_cases(
+        self,
+        component_id: str,
+        test_cases: List[Tuple[str, str, Optional[str], float]]
+    ) -> int:
+        """Create many test cases for a component in one transaction.
+
+        Each tuple is (name, status, value, weight). Returns the number of
+        test cases inserted.
+        """
+        if not test_cases:
+            return 0
+        with self.connection() as conn:
+            cursor = conn.executemany(
+                """INSERT INTO test_cases (component_id, name, status, value, weight)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(component_id, name, status, value, weight)
+                 for name, status, value, weight in test_cases]
+            )
+            return cursor.rowcount
+
     def get_test_cases_by_component(self, component_id: str) -> List[TestCase]:
         """Get all test cases for a component."""
         with self.connection() as conn:
             rows = conn.execute(
                 "SELECT * FROM test_cases WHERE component_id = ?", (component_id,)
             ).fetchall()
-            return [TestCase(**dict(row)) for row in rows]
+            return [TestCase._from_row(*row) for row in rows]
+
+    def get_test_cases_for_project(self, project_id: str) -> List[TestCase]:
+        """Get test cases for all components of a project in one query."""
+        with self.connection() as conn:
+            rows = conn.execute(
+                """SELECT t.* FROM test_cases t
+                   JOIN components c ON t.component_id = c.id
+                   WHERE c.project_id = ?""",
+                (project_id,)
+            ).fetchall()
+            return [TestCase._from_row(*row) for row in rows]
 
     # =========================================================================
     # GLOBAL TASK OPERATIONS
@@ -650,6 +1218,27 @@ class Database:
             sort_order=sort_order
         )
 
+    def create_global_tasks(
+        self,
+        project_id: str,
+        tasks: List[Tuple[str, bool, int]]
+    ) -> int:
+        """Create many global tasks in one transaction.
+
+        Each tuple is (text, done, sort_order). Returns the number of tasks
+        inserted.
+        """
+        if not tasks:
+            return 0
+        with self.connection() as conn:
+            cursor = conn.executemany(
+                """INSERT INTO global_tasks (project_id, text, done, sort_order)
+                   VALUES (?, ?, ?, ?)""",
+                [(project_id, text, 1 if done else 0, sort_order)
+                 for text, done, sort_order in tasks]
+            )
+            return cursor.rowcount
+
     def get_global_tasks_by_project(self, project_id: str) -> List[GlobalTask]:
         """Get all global tasks for a project."""
         with self.connection() as conn:
@@ -658,13 +1247,7 @@ class Database:
                    ORDER BY sort_order""",
                 (project_id,)
             ).fetchall()
-            return [GlobalTask(
-                id=row['id'],
-                project_id=row['project_id'],
-                text=row['text'],
-                done=bool(row['done']),
-                sort_order=row['sort_order']
-            ) for row in rows]
+            return [GlobalTask._from_row(*row) for row in rows]
 
     def update_global_task(self, id: int, done: bool) -> bool:
         """Update a global task's done status."""
@@ -717,17 +1300,207 @@ class Database:
 
     def get_agents_for_project(self, project_id: str) -> List[Agent]:
         """Get all agents assigned to components in a project."""
-        components = self.get_components_by_project(project_id)
-        agent_ids = {c.agent_id for c in components if c.agent_id}
-        return [self.get_agent(aid) for aid in agent_ids if self.get_agent(aid)]
+        with self.connection() as conn:
+            rows = conn.execute(
+                """SELECT * FROM agents
+                   WHERE id IN (SELECT DISTINCT agent_id FROM components
+                                WHERE project_id = ? AND agent_id IS NOT NULL)
+                   ORDER BY id""",
+                (project_id,)
+            ).fetchall()
+            return [Agent._from_row(*row) for row in rows]
+
+    def get_project_bundle(self, project_id: str,
+                           fields: Optional[set] = None) -> Optional[ProjectBundle]:
+        """
+        Fetch a project and all its graph data on a single connection.
+
+        Collapses the separate per-entity fetches (each of which opens its
+        own connection) into one transaction with a constant number of
+        statements, independent of component count.
+
+        Args:
+            project_id: The project ID
+            fields: Optional payload section names ('nodes', 'edges',
+                'agents', 'globalTasks') to fetch; None fetches everything.
+                Skipped sections come back as empty lists with no query.
+
+        Returns:
+            ProjectBundle, or None if the project does not exist
+        """
+        components = []
+        edges = []
+        global_tasks = []
+        agents = []
+        metrics = []
+        test_cases = []
+
+        with self.connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM projects WHERE id = ?", (project_id,)
+            ).fetchone()
+            if not row:
+                return None
+            project = self._row_to_project(row)
+
+            # Edges, tasks and agents don't depend on each other or on the
+            # component rows: overlap them on pool threads (own connections,
+            # concurrent WAL readers) with the node fetches on this one.
+            futures = {}
+            if fields is None or 'edges' in fields:
+                futures['edges'] = self._read_pool.submit(
+                    self._fetch_edge_rows, project_id)
+            if fields is None or 'globalTasks' in fields:
+                futures['global_tasks'] = self._read_pool.submit(
+                    self._fetch_global_task_rows, project_id)
+            if fields is None or 'agents' in fields:
+                futures['agents'] = self._read_pool.submit(
+                    self._fetch_agent_rows, project_id)
+
+            # Defaults are applied column-level in SQLite C (NULLIF mirrors
+            # the old `x or default` Python fallbacks, which also replaced
+            # 0 / empty string), so the serializer gets pre-defaulted values.
+            if fields is None or 'nodes' in fields:
+                components = [
+                    dict(r) for r in conn.execute(
+                        """SELECT id, label,
+                                  IFNULL(NULLIF(x, 0), 500) AS x,
+                                  IFNULL(NULLIF(y, 0), 100) AS y,
+                                  IFNULL(NULLIF(type, ''), 'node') AS type,
+                                  agent_id,
+                                  IFNULL(NULLIF(status, ''), 'pending') AS status,
+                                  last_edited,
+                                  IFNULL(summary, '') AS summary,
+                                  IFNULL(problem, '') AS problem,
+                                  goals, scope, requirements, risks,
+                                  inputs, outputs, files, subtasks
+                           FROM components WHERE project_id = ?
+                           ORDER BY components.y, components.x""",
+                        (project_id,)
+                    ).fetchall()
+                ]
+                metrics = [
+                    dict(r) for r in conn.execute(
+                        """SELECT m.component_id, m.requirement AS req,
+                                  IFNULL(m.value, 'TBD') AS value,
+                                  m.status, m.weight
+                           FROM metrics m
+                           JOIN components c ON m.component_id = c.id
+                           WHERE c.project_id = ?
+                           ORDER BY m.component_id""",
+                        (project_id,)
+                    ).fetchall()
+                ]
+                test_cases = [
+                    dict(r) for r in conn.execute(
+                        """SELECT t.component_id, t.name, t.status, t.value, t.weight
+                           FROM test_cases t
+                           JOIN components c ON t.component_id = c.id
+                           WHERE c.project_id = ?
+                           ORDER BY t.component_id""",
+                        (project_id,)
+                    ).fetchall()
+                ]
+
+        if 'edges' in futures:
+            edges = futures['edges'].result()
+        if 'global_tasks' in futures:
+            global_tasks = futures['global_tasks'].result()
+        if 'agents' in futures:
+            agents = futures['agents'].result()
+
+        return ProjectBundle(
+            project=project,
+            components=components,
+            edges=edges,
+            global_tasks=global_tasks,
+            agents=agents,
+            metrics=metrics,
+            test_cases=test_cases
+        )
+
+    # The bundle fetch helpers below alias/coalesce columns into exactly the
+    # Graph.html output shape, so each row becomes a response dict via the
+    # C-level dict(row) path. Each runs on its own connection so the read
+    # pool can execute them concurrently.
+
+    def _fetch_edge_rows(self, project_id: str) -> List[Dict[str, Any]]:
+        with self.connection() as conn:
+            return [
+                dict(r) for r in conn.execute(
+                    """SELECT from_id AS "from", to_id AS "to",
+                              IFNULL(label, '') AS label,
+                              IFNULL(type, 'data') AS type
+                       FROM edges WHERE project_id = ?""",
+                    (project_id,)
+                ).fetchall()
+            ]
+
+    def _fetch_global_task_rows(self, project_id: str) -> List[Dict[str, Any]]:
+        with self.connection() as conn:
+            global_tasks = [
+                dict(r) for r in conn.execute(
+                    """SELECT text, done FROM global_tasks
+                       WHERE project_id = ? ORDER BY sort_order""",
+                    (project_id,)
+                ).fetchall()
+            ]
+        for gt in global_tasks:
+            gt['done'] = bool(gt['done'])
+        return global_tasks
+
+    def _fetch_agent_rows(self, project_id: str) -> List[Dict[str, Any]]:
+        with self.connection() as conn:
+            return [
+                dict(r) for r in conn.execute(
+                    """SELECT id, name, IFNULL(dept, 'DEV') AS dept,
+                              IFNULL(initials, '') AS initials,
+                              status
+                       FROM agents
+                       WHERE id IN (SELECT DISTINCT agent_id FROM components
+                                    WHERE project_id = ?
+                                    AND agent_id IS NOT NULL)
+                       ORDER BY id""",
+                    (project_id,)
+                ).fetchall()
+            ]
+
+    def get_project_graph_json(self, project_id: str) -> Optional[str]:
+        """
+        Assemble the full Graph.html payload as one JSON string in SQLite.
+
+        Runs _GRAPH_JSON_SQL: a single statement whose json_object /
+        json_group_array aggregates build the entire response inside the
+        database, so Python never iterates rows or allocates payload dicts.
+
+        Returns:
+            The payload as a JSON string, or None if the project does not
+            exist or this SQLite build lacks the JSON functions (< 3.38)
+        """
+        if not _HAS_JSON_FUNCS:
+            return None
+        with self.connection() as conn:
+            row = conn.execute(_GRAPH_JSON_SQL, (project_id,)).fetchone()
+            return row[0] if row else None
 
     def mark_global_task_done(self, project_id: str, task_pattern: str) -> bool:
-        """Mark a global task as done by matching text pattern."""
+        """
+        Mark a global task as done by matching text pattern.
+
+        The pattern is looked up as a phrase in the global_tasks_fts
+        mirror (inverted-index MATCH instead of a LIKE '%..%' scan), so
+        it matches on word boundaries rather than arbitrary substrings.
+        """
+        if not task_pattern:
+            return False
+        phrase = '"' + task_pattern.replace('"', '""') + '"'
         with self.connection() as conn:
             cursor = conn.execute(
                 """UPDATE global_tasks SET done = 1
-                   WHERE project_id = ? AND text LIKE ?""",
-                (project_id, f"%{task_pattern}%")
+                   WHERE project_id = ? AND id IN (
+                       SELECT rowid FROM global_tasks_fts
+                       WHERE global_tasks_fts MATCH ?)""",
+                (project_id, phrase)
             )
             return cursor.rowcount > 0
 
@@ -745,20 +1518,20 @@ class Database:
     ) -> ChatMessage:
         """Create a new chat message."""
         with self.connection() as conn:
-            cursor = conn.execute(
+            row = conn.execute(
                 """INSERT INTO chat_history (project_id, component_id, role, content, section)
-                   VALUES (?, ?, ?, ?, ?)""",
+                   VALUES (?, ?, ?, ?, ?)
+                   RETURNING id, created_at""",
                 (project_id, component_id, role, content, section)
-            )
-            msg_id = cursor.lastrowid
+            ).fetchone()
         return ChatMessage(
-            id=msg_id,
+            id=row[0],
             project_id=project_id,
             component_id=component_id,
             role=role,
             content=content,
             section=section,
-            created_at=datetime.now().isoformat()
+            created_at=row[1]
         )
 
     def get_chat_history(
@@ -818,35 +1591,111 @@ class Database:
 
         Returns the full data structure expected by the frontend.
         """
+        # Memoized on the same version probe the serializer cache uses
+        # (it also covers writes from other processes), so refreshes with
+        # no intervening change skip all the queries below. Callers treat
+        # the returned dict as read-only.
+        version = self.get_project_version(project_id)
+        if version is None:
+            return None
+        cached = self._graph_cache.get(project_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
         project = self.get_project(project_id)
         if not project:
             return None
 
-        components = self.get_components_by_project(project_id)
-        edges = self.get_edges_by_project(project_id)
-        global_tasks = self.get_global_tasks_by_project(project_id)
-
-        # Get agents that are assigned to components
-        agent_ids = {c.agent_id for c in components if c.agent_id}
-        agents = [self.get_agent(aid) for aid in agent_ids if aid]
-        agents = [a for a in agents if a]  # Filter None
+        # Edges, tasks and agents are flat shapes: fetch them as positional
+        # tuples and index by column offset, which skips model construction
+        # and per-row attribute resolution entirely.
+        with self.connection() as conn:
+            # Components come back already node-shaped (aliases + defaults
+            # in SQL), so nodes are built column-by-column from rows
+            # instead of round-tripping through Component objects.
+            component_rows = conn.execute(
+                """SELECT id, label, x, y, type, agent_id AS agentId,
+                          status, last_edited AS lastEdited,
+                          IFNULL(summary, '') AS summary,
+                          IFNULL(problem, '') AS problem,
+                          goals, scope, requirements, risks,
+                          inputs, outputs, files, subtasks
+                   FROM components WHERE project_id = ?
+                   ORDER BY y, x""",
+                (project_id,)
+            ).fetchall()
+            edge_rows = conn.execute(
+                """SELECT from_id, to_id, IFNULL(label, ''), IFNULL(type, 'data')
+                   FROM edges WHERE project_id = ?""",
+                (project_id,)
+            ).fetchall()
+            task_rows = conn.execute(
+                """SELECT text, done FROM global_tasks WHERE project_id = ?
+                   ORDER BY sort_order""",
+                (project_id,)
+            ).fetchall()
+            agent_ids = sorted({r['agentId'] for r in component_rows if r['agentId']})
+            agent_rows = conn.execute(
+                f"""SELECT id, name, IFNULL(dept, 'DEV'), IFNULL(initials, ''), status
+                    FROM agents WHERE id IN ({','.join('?' * len(agent_ids))})""",
+                agent_ids
+            ).fetchall() if agent_ids else []
+
+            # Metrics and test cases for every component in two bulk
+            # queries (instead of two statements per component), aliased
+            # into the to_dict() output shape and bucketed by component.
+            metric_rows = conn.execute(
+                """SELECT m.component_id, m.requirement AS name,
+                          IFNULL(m.value, '') AS target, m.status, m.weight
+                   FROM metrics m JOIN components c ON m.component_id = c.id
+                   WHERE c.project_id = ?""",
+                (project_id,)
+            ).fetchall()
+            test_rows = conn.execute(
+                """SELECT t.component_id, t.name,
+                          IFNULL(t.value, '') AS description, t.status, t.weight
+                   FROM test_cases t JOIN components c ON t.component_id = c.id
+                   WHERE c.project_id = ?""",
+                (project_id,)
+            ).fetchall()
 
-        # Build nodes with metrics and test cases
+        metrics_by_comp = {}
+        for r in metric_rows:
+            d = dict(r)
+            metrics_by_comp.setdefault(d.pop('component_id'), []).append(d)
+        tests_by_comp = {}
+        for r in test_rows:
+            d = dict(r)
+            tests_by_comp.setdefault(d.pop('component_id'), []).append(d)
+
+        # Build nodes with metrics and test cases. Only the eight JSON
+        # columns need per-field work; everything else is already in its
+        # final key/value shape straight off the row.
         nodes = []
-        for comp in components:
-            node = comp.to_graph_node()
-            node['metrics'] = [m.to_dict() for m in self.get_metrics_by_component(comp.id)]
-            node['testCases'] = [t.to_dict() for t in self.get_test_cases_by_component(comp.id)]
+        for row in component_rows:
+            node = dict(row)
+            for field in _COMPONENT_JSON_FIELDS:
+                node[field] = _parse_json_list(node[field])
+            node['metrics'] = metrics_by_comp.get(node['id'], [])
+            node['testCases'] = tests_by_comp.get(node['id'], [])
             nodes.append(node)
 
-        return {
+        data = {
             'projectName': project.name,
-            'projectSummary': project.summary or '',
-            'projectProblem': project.problem or '',
+            'projectSummary': project.summary,
+            'projectProblem': project.problem,
             'questions': project.questions or [],
-            'globalTasks': [gt.to_graph_task() for gt in global_tasks],
-            'agents': [a.to_graph_agent() for a in agents],
+            'globalTasks': [{'text': r[0], 'done': bool(r[1])} for r in task_rows],
+            'agents': [
+                {'id': r[0], 'name': r[1], 'dept': r[2], 'initials': r[3], 'status': r[4]}
+                for r in agent_rows
+            ],
             'nodes': nodes,
-            'edges': [e.to_graph_edge() for e in edges],
+            'edges': [
+                {'from': r[0], 'to': r[1], 'label': r[2], 'type': r[3]}
+                for r in edge_rows
+            ],
             'timestamp': datetime.now().isoformat()
         }
+        self._graph_cache[project_id] = (version, data)
+        return data
@@ -2,13 +2,60 @@
 Data models for Agent Orchestrator.
 Dataclasses that map to database tables and support Graph.html format.
 """
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 import json
 
+# orjson's C decoder is several times faster than stdlib json on the
+# small list columns parsed per row; fall back to stdlib if missing.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+
+# Shared sentinel for absent list columns. Immutable, so eight empty-list
+# allocations per Component collapse into one process-wide object; every
+# consumer already copies before mutating (`comp.files or []`), and an
+# accidental in-place append on an empty default now raises instead of
+# silently cross-contaminating instances.
+_EMPTY: tuple = ()
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """
+    Intern an enum-like column value ('pending', 'info', 'data', ...).
+
+    These fields draw from tiny fixed vocabularies, so every row shares
+    one str object per value and equality checks short-circuit on
+    identity. None and non-str values pass through untouched.
+    """
+    return sys.intern(value) if type(value) is str else value
+
 
-@dataclass
+def _parse_json_list(text: Optional[str]) -> Tuple[Any, ...]:
+    """
+    Parse a stored JSON list column, treating NULL/''/garbage as empty.
+
+    Returns a tuple: parsed columns are shared immutably (consumers copy
+    before mutating), and encoders walk tuples at least as fast as lists.
+    """
+    if not text:
+        return _EMPTY
+    try:
+        return tuple(_loads(text))
+    except ValueError:
+        return _EMPTY
+
+
+@dataclass(slots=True)
 class Project:
     """Represents a project in the orchestrator."""
     id: str
@@ -17,103 +64,180 @@ class Project:
     summary: Optional[str] = None
     problem: Optional[str] = None
     transcript: Optional[str] = None
-    transcript: Optional[str] = None
     work_plan: Optional[str] = None
     questions: List[str] = field(default_factory=list)
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
 
+    def __post_init__(self):
+        self.phase = _intern(self.phase)
+        # NULL columns normalize to '' here so serializers read the
+        # attribute straight instead of branching on `or ''` per call.
+        self.summary = self.summary or ''
+        self.problem = self.problem or ''
+
+    # Identity is the primary key: compare ids instead of the dataclass
+    # default field-by-field sweep.
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    _DICT_KEYS = ('id', 'name', 'phase', 'summary', 'problem', 'transcript',
+                  'work_plan', 'questions', 'created_at', 'updated_at')
+    _DICT_VALUES = attrgetter(*_DICT_KEYS)
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'id': self.id,
-            'name': self.name,
-            'phase': self.phase,
-            'summary': self.summary,
-            'problem': self.problem,
-            'transcript': self.transcript,
-            'transcript': self.transcript,
-            'work_plan': self.work_plan,
-            'questions': self.questions,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
+        # Keys interned once at class definition; dict built in one
+        # C-level call instead of re-parsing the literal per instance.
+        return dict(zip(self._DICT_KEYS, self._DICT_VALUES(self)))
+
+
+# Duplicate field declarations silently coalesce in the annotations dict
+# (transcript was once declared twice above); fail loudly at import time
+# if a field name ever repeats again.
+assert len({f.name for f in fields(Project)}) == len(fields(Project)), \
+    "Project declares a duplicate field"
+
+
+def _lazy_json_attr(slot: str) -> property:
+    """
+    Property over a slot that may hold raw JSON column text.
+
+    The raw string is parsed (and replaced) on first access, so list
+    columns the consumer never reads are never decoded.
+    """
+    def _get(self):
+        value = getattr(self, slot)
+        if type(value) is str:
+            value = _parse_json_list(value)
+            setattr(self, slot, value)
+        return value
+
+    def _set(self, value):
+        setattr(self, slot, value)
+
+    return property(_get, _set)
 
 
-@dataclass
 class Component:
-    """Represents a component/node in the system architecture."""
-    id: str
-    project_id: str
-    label: str
-    parent_id: Optional[str] = None
-    type: str = 'node'
-    status: str = 'pending'
-    x: int = 0
-    y: int = 0
-    summary: Optional[str] = None
-    problem: Optional[str] = None
-    goals: List[str] = field(default_factory=list)
-    scope: List[str] = field(default_factory=list)
-    requirements: List[str] = field(default_factory=list)
-    risks: List[str] = field(default_factory=list)
-    inputs: List[str] = field(default_factory=list)
-    outputs: List[str] = field(default_factory=list)
-    files: List[Dict] = field(default_factory=list)
-    subtasks: List[Dict] = field(default_factory=list)
-    agent_id: Optional[str] = None
-    last_edited: Optional[str] = None
+    """
+    Represents a component/node in the system architecture.
+
+    Not a dataclass like its siblings: the JSON list columns (goals,
+    scope, ...) hold the raw column text until first access and decode
+    lazily, so consumers that touch only one of them — file attachment,
+    subtask updates — skip parsing the other seven.
+    """
+    # Slot order is storage order: the graph/status hot path reads the
+    # first eight, so they share the leading cache lines while the cold
+    # JSON blobs sit at the end.
+    __slots__ = (
+        'id', 'label', 'type', 'status', 'x', 'y', 'agent_id',
+        'last_edited', 'project_id', 'parent_id', 'summary', 'problem',
+        '_goals', '_scope', '_requirements', '_risks',
+        '_inputs', '_outputs', '_files', '_subtasks'
+    )
+
+    def __init__(self, id: str, project_id: str, label: str,
+                 parent_id: Optional[str] = None, type: str = 'node',
+                 status: str = 'pending', x: int = 0, y: int = 0,
+                 summary: Optional[str] = None, problem: Optional[str] = None,
+                 goals=None, scope=None, requirements=None, risks=None,
+                 inputs=None, outputs=None, files=None, subtasks=None,
+                 agent_id: Optional[str] = None,
+                 last_edited: Optional[str] = None):
+        self.id = id
+        self.project_id = project_id
+        self.label = label
+        self.parent_id = parent_id
+        self.type = _intern(type)
+        self.status = _intern(status)
+        self.x = x
+        self.y = y
+        # NULL columns normalize to '' so graph/serializer reads skip
+        # the per-call `or ''` branch.
+        self.summary = summary or ''
+        self.problem = problem or ''
+        # Lists pass through; raw JSON text stays a string until read.
+        # Absent columns share the _EMPTY sentinel instead of allocating
+        # a fresh list each.
+        self._goals = _EMPTY if goals is None else goals
+        self._scope = _EMPTY if scope is None else scope
+        self._requirements = _EMPTY if requirements is None else requirements
+        self._risks = _EMPTY if risks is None else risks
+        self._inputs = _EMPTY if inputs is None else inputs
+        self._outputs = _EMPTY if outputs is None else outputs
+        self._files = _EMPTY if files is None else files
+        self._subtasks = _EMPTY if subtasks is None else subtasks
+        self.agent_id = agent_id
+        self.last_edited = last_edited
+
+    goals = _lazy_json_attr('_goals')
+    scope = _lazy_json_attr('_scope')
+    requirements = _lazy_json_attr('_requirements')
+    risks = _lazy_json_attr('_risks')
+    inputs = _lazy_json_attr('_inputs')
+    outputs = _lazy_json_attr('_outputs')
+    files = _lazy_json_attr('_files')
+    subtasks = _lazy_json_attr('_subtasks')
+
+    def __repr__(self) -> str:
+        return f"Component(id={self.id!r}, label={self.label!r})"
+
+    # Identity is the primary key: two fetches of the same component
+    # compare equal without a field-by-field sweep.
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    @classmethod
+    def _from_row(cls, id, project_id, parent_id, label, type, status, x, y,
+                  summary, problem, goals, scope, requirements, risks,
+                  inputs, outputs, files, subtasks, agent_id, last_edited):
+        """
+        Build from a SELECT * row unpacked positionally (schema.sql column
+        order). The JSON columns are passed through raw and parse lazily
+        on first attribute access.
+        """
+        return cls(
+            id, project_id, label, parent_id, type, status, x, y,
+            summary, problem,
+            goals, scope, requirements, risks,
+            inputs, outputs, files, subtasks,
+            agent_id, last_edited
+        )
+
+    _GRAPH_KEYS = ('id', 'label', 'x', 'y', 'type', 'agentId', 'status',
+                   'lastEdited', 'summary', 'problem', 'goals', 'scope',
+                   'requirements', 'risks', 'inputs', 'outputs', 'files',
+                   'subtasks')
+    _GRAPH_VALUES = attrgetter(
+        'id', 'label', 'x', 'y', 'type', 'agent_id', 'status',
+        'last_edited', 'summary', 'problem', 'goals', 'scope',
+        'requirements', 'risks', 'inputs', 'outputs', 'files', 'subtasks')
 
     def to_graph_node(self) -> Dict[str, Any]:
         """Convert to Graph.html node format."""
-        return {
-            'id': self.id,
-            'label': self.label,
-            'x': self.x,
-            'y': self.y,
-            'type': self.type,
-            'agentId': self.agent_id,
-            'status': self.status,
-            'lastEdited': self.last_edited,
-            'summary': self.summary or '',
-            'problem': self.problem or '',
-            'goals': self.goals,
-            'scope': self.scope,
-            'requirements': self.requirements,
-            'risks': self.risks,
-            'inputs': self.inputs,
-            'outputs': self.outputs,
-            'files': self.files,
-            'subtasks': self.subtasks,
-            'metrics': [],  # Loaded separately
-            'testCases': []  # Loaded separately
-        }
+        node = dict(zip(self._GRAPH_KEYS, self._GRAPH_VALUES(self)))
+        node['metrics'] = []  # Loaded separately
+        node['testCases'] = []  # Loaded separately
+        return node
+
+    _DICT_KEYS = ('id', 'project_id', 'parent_id', 'label', 'type',
+                  'status', 'x', 'y', 'summary', 'problem', 'goals',
+                  'scope', 'requirements', 'risks', 'inputs', 'outputs',
+                  'files', 'subtasks', 'agent_id', 'last_edited')
+    _DICT_VALUES = attrgetter(*_DICT_KEYS)
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'id': self.id,
-            'project_id': self.project_id,
-            'parent_id': self.parent_id,
-            'label': self.label,
-            'type': self.type,
-            'status': self.status,
-            'x': self.x,
-            'y': self.y,
-            'summary': self.summary,
-            'problem': self.problem,
-            'goals': self.goals,
-            'scope': self.scope,
-            'requirements': self.requirements,
-            'risks': self.risks,
-            'inputs': self.inputs,
-            'outputs': self.outputs,
-            'files': self.files,
-            'subtasks': self.subtasks,
-            'agent_id': self.agent_id,
-            'last_edited': self.last_edited
-        }
+        return dict(zip(self._DICT_KEYS, self._DICT_VALUES(self)))
 
 
-@dataclass
+@dataclass(slots=True)
 class Edge:
     """Represents a connection between components."""
     id: Optional[int]
@@ -123,27 +247,30 @@ class Edge:
     label: str = ''
     type: str = 'data'  # data, api, auth, schema, log
 
+    def __post_init__(self):
+        self.type = _intern(self.type)
+
+    @classmethod
+    def _from_row(cls, id, project_id, from_id, to_id, label, type):
+        """Build from a SELECT * row unpacked positionally."""
+        return cls(id, project_id, from_id, to_id, label, type)
+
+    _GRAPH_KEYS = ('from', 'to', 'label', 'type')
+    _GRAPH_VALUES = attrgetter('from_id', 'to_id', 'label', 'type')
+
     def to_graph_edge(self) -> Dict[str, Any]:
         """Convert to Graph.html edge format."""
-        return {
-            'from': self.from_id,
-            'to': self.to_id,
-            'label': self.label,
-            'type': self.type
-        }
+        return dict(zip(self._GRAPH_KEYS, self._GRAPH_VALUES(self)))
+
+    _DICT_KEYS = ('id', 'project_id', 'from', 'to', 'label', 'type')
+    _DICT_VALUES = attrgetter('id', 'project_id', 'from_id', 'to_id',
+                              'label', 'type')
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'id': self.id,
-            'project_id': self.project_id,
-            'from': self.from_id,
-            'to': self.to_id,
-            'label': self.label,
-            'type': self.type
-        }
+        return dict(zip(self._DICT_KEYS, self._DICT_VALUES(self)))
 
 
-@dataclass
+@dataclass(slots=True)
 class Metric:
     """Represents a requirement metric for a component."""
     id: Optional[int]
@@ -153,16 +280,24 @@ class Metric:
     status: str = 'pending'  # pass, fail, pending
     weight: float = 1.0
 
+    def __post_init__(self):
+        self.status = _intern(self.status)
+
+    @classmethod
+    def _from_row(cls, id, component_id, requirement, value, status, weight):
+        """Build from a SELECT * row unpacked positionally."""
+        return cls(id, component_id, requirement, value, status, weight)
+
+    _DICT_KEYS = ('name', 'target', 'status', 'weight')
+    _DICT_VALUES = attrgetter('requirement', 'value', 'status', 'weight')
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'name': self.requirement,
-            'target': self.value or '',
-            'status': self.status,
-            'weight': self.weight
-        }
+        d = dict(zip(self._DICT_KEYS, self._DICT_VALUES(self)))
+        d['target'] = d['target'] or ''
+        return d
 
 
-@dataclass
+@dataclass(slots=True)
 class TestCase:
     """Represents a test case for a component."""
     id: Optional[int]
@@ -172,16 +307,24 @@ class TestCase:
     value: Optional[str] = None
     weight: float = 1.0
 
+    def __post_init__(self):
+        self.status = _intern(self.status)
+
+    @classmethod
+    def _from_row(cls, id, component_id, name, status, value, weight):
+        """Build from a SELECT * row unpacked positionally."""
+        return cls(id, component_id, name, status, value, weight)
+
+    _DICT_KEYS = ('name', 'description', 'status', 'weight')
+    _DICT_VALUES = attrgetter('name', 'value', 'status', 'weight')
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'name': self.name,
-            'description': self.value or '',
-            'status': self.status,
-            'weight': self.weight
-        }
+        d = dict(zip(self._DICT_KEYS, self._DICT_VALUES(self)))
+        d['description'] = d['description'] or ''
+        return d
 
 
-@dataclass
+@dataclass(slots=True)
 class Manager:
     """Represents a component manager agent."""
     id: str
@@ -191,18 +334,24 @@ class Manager:
     created_by: Optional[str] = None
     created_at: Optional[str] = None
 
+    def __post_init__(self):
+        self.status = _intern(self.status)
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    _DICT_KEYS = ('id', 'project_id', 'component_id', 'status',
+                  'created_by', 'created_at')
+    _DICT_VALUES = attrgetter(*_DICT_KEYS)
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'id': self.id,
-            'project_id': self.project_id,
-            'component_id': self.component_id,
-            'status': self.status,
-            'created_by': self.created_by,
-            'created_at': self.created_at
-        }
+        return dict(zip(self._DICT_KEYS, self._DICT_VALUES(self)))
 
 
-@dataclass
+@dataclass(slots=True)
 class Agent:
     """Represents a worker agent."""
     id: str
@@ -215,31 +364,43 @@ class Agent:
     created_at: Optional[str] = None
     last_active: Optional[str] = None
 
+    def __post_init__(self):
+        self.dept = _intern(self.dept)
+        self.status = _intern(self.status)
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    @classmethod
+    def _from_row(cls, id, name, dept, initials, manager_id, task_id,
+                  status, created_at, last_active):
+        """Build from a SELECT * row unpacked positionally."""
+        return cls(id, name, dept, initials, manager_id, task_id,
+                   status, created_at, last_active)
+
     def to_graph_agent(self) -> Dict[str, Any]:
         """Convert to Graph.html agent format."""
         return {
             'id': self.id,
             'name': self.name,
             'dept': self.dept or 'DEV',
-            'initials': self.initials or self.name[:2].upper(),
+            # Initials are persisted uppercase at write time (create_agent)
+            'initials': self.initials or '',
             'status': self.status
         }
 
+    _DICT_KEYS = ('id', 'name', 'dept', 'initials', 'manager_id',
+                  'task_id', 'status', 'created_at', 'last_active')
+    _DICT_VALUES = attrgetter(*_DICT_KEYS)
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'id': self.id,
-            'name': self.name,
-            'dept': self.dept,
-            'initials': self.initials,
-            'manager_id': self.manager_id,
-            'task_id': self.task_id,
-            'status': self.status,
-            'created_at': self.created_at,
-            'last_active': self.last_active
-        }
+        return dict(zip(self._DICT_KEYS, self._DICT_VALUES(self)))
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents a work task."""
     id: Optional[int]
@@ -255,24 +416,29 @@ class Task:
     created_at: Optional[str] = None
     completed_at: Optional[str] = None
 
+    def __post_init__(self):
+        self.status = _intern(self.status)
+
+    @classmethod
+    def _from_row(cls, id, component_id, manager_id, title, description,
+                  logic, status, priority, assigned_agent, created_by,
+                  created_at, completed_at):
+        """Build from a SELECT * row unpacked positionally."""
+        return cls(id, component_id, title, manager_id, description,
+                   logic, status, priority, assigned_agent, created_by,
+                   created_at, completed_at)
+
+    _DICT_KEYS = ('id', 'component_id', 'manager_id', 'title',
+                  'description', 'logic', 'status', 'priority',
+                  'assigned_agent', 'created_by', 'created_at',
+                  'completed_at')
+    _DICT_VALUES = attrgetter(*_DICT_KEYS)
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'id': self.id,
-            'component_id': self.component_id,
-            'manager_id': self.manager_id,
-            'title': self.title,
-            'description': self.description,
-            'logic': self.logic,
-            'status': self.status,
-            'priority': self.priority,
-            'assigned_agent': self.assigned_agent,
-            'created_by': self.created_by,
-            'created_at': self.created_at,
-            'completed_at': self.completed_at
-        }
+        return dict(zip(self._DICT_KEYS, self._DICT_VALUES(self)))
 
 
-@dataclass
+@dataclass(slots=True)
 class Log:
     """Represents a log entry."""
     id: Optional[int]
@@ -285,21 +451,25 @@ class Log:
     level: str = 'info'  # debug, info, warn, error
     timestamp: Optional[str] = None
 
+    def __post_init__(self):
+        self.level = _intern(self.level)
+
+    @classmethod
+    def _from_row(cls, id, project_id, component_id, task_id, agent_id,
+                  action, message, level, timestamp):
+        """Build from a SELECT * row unpacked positionally."""
+        return cls(id, action, message, project_id, component_id,
+                   task_id, agent_id, level, timestamp)
+
+    _DICT_KEYS = ('id', 'project_id', 'component_id', 'task_id',
+                  'agent_id', 'action', 'message', 'level', 'timestamp')
+    _DICT_VALUES = attrgetter(*_DICT_KEYS)
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'id': self.id,
-            'project_id': self.project_id,
-            'component_id': self.component_id,
-            'task_id': self.task_id,
-            'agent_id': self.agent_id,
-            'action': self.action,
-            'message': self.message,
-            'level': self.level,
-            'timestamp': self.timestamp
-        }
+        return dict(zip(self._DICT_KEYS, self._DICT_VALUES(self)))
 
 
-@dataclass
+@dataclass(slots=True)
 class GlobalTask:
     """Represents a project-level phase/task."""
     id: Optional[int]
@@ -308,24 +478,26 @@ class GlobalTask:
     done: bool = False
     sort_order: int = 0
 
+    @classmethod
+    def _from_row(cls, id, project_id, text, done, sort_order):
+        """Build from a SELECT * row unpacked positionally."""
+        return cls(id, project_id, text, bool(done), sort_order)
+
+    _GRAPH_KEYS = ('text', 'done')
+    _GRAPH_VALUES = attrgetter('text', 'done')
+
     def to_graph_task(self) -> Dict[str, Any]:
         """Convert to Graph.html globalTasks format."""
-        return {
-            'text': self.text,
-            'done': self.done
-        }
+        return dict(zip(self._GRAPH_KEYS, self._GRAPH_VALUES(self)))
+
+    _DICT_KEYS = ('id', 'project_id', 'text', 'done', 'sort_order')
+    _DICT_VALUES = attrgetter(*_DICT_KEYS)
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'id': self.id,
-            'project_id': self.project_id,
-            'text': self.text,
-            'done': self.done,
-            'sort_order': self.sort_order
-        }
+        return dict(zip(self._DICT_KEYS, self._DICT_VALUES(self)))
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatMessage:
     """Represents a chat message in component/PRD conversations."""
     id: Optional[int]
@@ -336,16 +508,12 @@ class ChatMessage:
     section: Optional[str] = None
     created_at: Optional[str] = None
 
+    _DICT_KEYS = ('id', 'project_id', 'component_id', 'role',
+                  'content', 'section', 'created_at')
+    _DICT_VALUES = attrgetter(*_DICT_KEYS)
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'id': self.id,
-            'project_id': self.project_id,
-            'component_id': self.component_id,
-            'role': self.role,
-            'content': self.content,
-            'section': self.section,
-            'created_at': self.created_at
-        }
+        return dict(zip(self._DICT_KEYS, self._DICT_VALUES(self)))
 
     def to_chat_format(self) -> Dict[str, Any]:
         """Convert to frontend chat format."""
@@ -96,7 +96,7 @@ CREATE TABLE IF NOT EXISTS agents (
     id TEXT PRIMARY KEY,
     name TEXT NOT NULL,
     dept TEXT,           -- DISC, DES, MGT, DEV
-    initials TEXT,
+    initials TEXT NOT NULL DEFAULT '',
     manager_id TEXT,
     task_id INTEGER,
     status TEXT DEFAULT 'idle',  -- active, complete, pending, working, idle
@@ -164,35 +164,86 @@ CREATE TABLE IF NOT EXISTS chat_history (
 );
 
 -- Indexes for performance
-CREATE INDEX IF NOT EXISTS idx_components_project ON components(project_id);
+-- Composite indexes match the hot query shapes (WHERE + ORDER BY) so the
+-- lookups below are satisfied by a single B-tree walk. The widened
+-- versions use new names; dropping the old single-column definitions
+-- migrates existing databases and is a no-op afterwards.
+DROP INDEX IF EXISTS idx_components_project;
+DROP INDEX IF EXISTS idx_tasks_component;
+DROP INDEX IF EXISTS idx_tasks_manager;
+DROP INDEX IF EXISTS idx_logs_project;
+DROP INDEX IF EXISTS idx_logs_agent;
+DROP INDEX IF EXISTS idx_global_tasks_project;
+DROP INDEX IF EXISTS idx_chat_history_project;
+DROP INDEX IF EXISTS idx_chat_history_component;
+CREATE INDEX IF NOT EXISTS idx_projects_created ON projects(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_components_project_pos ON components(project_id, y, x);
 CREATE INDEX IF NOT EXISTS idx_components_parent ON components(parent_id);
 CREATE INDEX IF NOT EXISTS idx_edges_project ON edges(project_id);
 CREATE INDEX IF NOT EXISTS idx_edges_from ON edges(from_id);
 CREATE INDEX IF NOT EXISTS idx_edges_to ON edges(to_id);
-CREATE INDEX IF NOT EXISTS idx_tasks_component ON tasks(component_id);
-CREATE INDEX IF NOT EXISTS idx_tasks_manager ON tasks(manager_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_component_priority ON tasks(component_id, priority DESC);
+CREATE INDEX IF NOT EXISTS idx_tasks_manager_priority ON tasks(manager_id, priority DESC);
 CREATE INDEX IF NOT EXISTS idx_tasks_agent ON tasks(assigned_agent);
-CREATE INDEX IF NOT EXISTS idx_logs_project ON logs(project_id);
-CREATE INDEX IF NOT EXISTS idx_logs_agent ON logs(agent_id);
+CREATE INDEX IF NOT EXISTS idx_logs_project_ts ON logs(project_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_logs_agent_ts ON logs(agent_id, timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs(timestamp);
-CREATE INDEX IF NOT EXISTS idx_global_tasks_project ON global_tasks(project_id);
+CREATE INDEX IF NOT EXISTS idx_global_tasks_project_order ON global_tasks(project_id, sort_order);
 CREATE INDEX IF NOT EXISTS idx_metrics_component ON metrics(component_id);
 CREATE INDEX IF NOT EXISTS idx_test_cases_component ON test_cases(component_id);
 CREATE INDEX IF NOT EXISTS idx_managers_project ON managers(project_id);
 CREATE INDEX IF NOT EXISTS idx_agents_manager ON agents(manager_id);
-CREATE INDEX IF NOT EXISTS idx_chat_history_project ON chat_history(project_id);
-CREATE INDEX IF NOT EXISTS idx_chat_history_component ON chat_history(component_id);
+CREATE INDEX IF NOT EXISTS idx_chat_history_project_time ON chat_history(project_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_chat_history_component_time ON chat_history(component_id, created_at);
+
+-- Full-text mirror of global_tasks.text so text-pattern lookups
+-- (mark_global_task_done) use the inverted index instead of LIKE '%..%'
+-- scans. External-content table: rows live in global_tasks, the
+-- triggers keep the index in sync, and 'rebuild' backfills databases
+-- that predate the mirror.
+CREATE VIRTUAL TABLE IF NOT EXISTS global_tasks_fts USING fts5(
+    text,
+    content='global_tasks',
+    content_rowid='id'
+);
+INSERT INTO global_tasks_fts(global_tasks_fts) VALUES ('rebuild');
+
+CREATE TRIGGER IF NOT EXISTS global_tasks_fts_insert
+AFTER INSERT ON global_tasks
+BEGIN
+    INSERT INTO global_tasks_fts(rowid, text) VALUES (NEW.id, NEW.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS global_tasks_fts_delete
+AFTER DELETE ON global_tasks
+BEGIN
+    INSERT INTO global_tasks_fts(global_tasks_fts, rowid, text)
+    VALUES ('delete', OLD.id, OLD.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS global_tasks_fts_update
+AFTER UPDATE OF text ON global_tasks
+BEGIN
+    INSERT INTO global_tasks_fts(global_tasks_fts, rowid, text)
+    VALUES ('delete', OLD.id, OLD.text);
+    INSERT INTO global_tasks_fts(rowid, text) VALUES (NEW.id, NEW.text);
+END;
 
 -- Trigger to update updated_at on projects
-CREATE TRIGGER IF NOT EXISTS update_project_timestamp
+-- (millisecond precision so back-to-back edits yield distinct versions).
+-- Dropped first so databases that predate the millisecond change don't
+-- keep their second-precision triggers through the migration.
+DROP TRIGGER IF EXISTS update_project_timestamp;
+CREATE TRIGGER update_project_timestamp
 AFTER UPDATE ON projects
 BEGIN
-    UPDATE projects SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+    UPDATE projects SET updated_at = STRFTIME('%Y-%m-%d %H:%M:%f', 'now') WHERE id = NEW.id;
 END;
 
 -- Trigger to update last_edited on components
-CREATE TRIGGER IF NOT EXISTS update_component_timestamp
+DROP TRIGGER IF EXISTS update_component_timestamp;
+CREATE TRIGGER update_component_timestamp
 AFTER UPDATE ON components
 BEGIN
-    UPDATE components SET last_edited = CURRENT_TIMESTAMP WHERE id = NEW.id;
+    UPDATE components SET last_edited = STRFTIME('%Y-%m-%d %H:%M:%f', 'now') WHERE id = NEW.id;
 END;
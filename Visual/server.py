@@ -31,17 +31,150 @@ KEY FUNCTIONS:
 ================================================================================
 """
 
+import functools
 import http.server
-import socketserver
+import logging
+import queue
+import re
 import subprocess
+import threading
 import urllib.parse
 import os
 import json
 import sys
-import traceback
+import zlib
+from logging.handlers import QueueHandler, QueueListener
+
+# Request threads enqueue log records in O(1); the listener thread does
+# the blocking stream I/O, so handlers never serialize on the stdout
+# lock while holding a request.
+_log_queue = queue.Queue(-1)
+logger = logging.getLogger('server')
+logger.setLevel(logging.INFO)
+logger.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+
+# orjson serializes response dicts straight to bytes in C; fall back to
+# stdlib json if it isn't installed (same pattern as api/serializers).
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Request bodies and LLM replies parse through one hook; both loaders
+# accept bytes directly, so raw POST data skips the utf-8 decode step.
+_load_json = orjson.loads if orjson is not None else json.loads
+
+
+# Change verbs that mean a chat message wants component edits; anything
+# else is pure Q&A and can skip the JSON envelope entirely.
+_CHANGE_KW = re.compile(r'\b(add|remove|update|set|change|modify|delete)\b', re.I)
+
+# Shape of every ID the app generates. Garbage path probes fail this
+# before they cost a database round-trip.
+_ID_RE = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def _extract_llm_json(response: str):
+    """Return the validated JSON text of an LLM reply, or None.
 
-# Add current directory to path for imports
-sys.path.insert(0, os.path.dirname(__file__))
+    The text (not the parsed object) comes back so callers that forward
+    the payload verbatim can splice it into the response body without a
+    decode + re-encode round-trip. The fallback takes the outermost
+    {...} span with find/rfind — two linear C scans, no regex
+    backtracking on malformed replies.
+    """
+    try:
+        _load_json(response)
+        return response
+    except ValueError:
+        start, end = response.find('{'), response.rfind('}')
+        if start != -1 and end > start:
+            span = response[start:end + 1]
+            try:
+                _load_json(span)
+                return span
+            except ValueError:
+                pass
+    return None
+
+
+def _dump_json_str(value) -> str:
+    """Compact JSON text for interpolating values into prompts."""
+    if orjson is not None:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value, separators=(',', ':'))
+
+
+def _dump_json_file(data) -> bytes:
+    """Compact JSON bytes for the legacy graph_data.json snapshot.
+
+    The file's consumers are browsers (served verbatim), so it stays
+    JSON rather than a binary format; compact form roughly halves the
+    write and the response body versus the old indent=2 output.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+# Fixed response headers, precomputed as wire bytes once: send_header
+# re-formats and buffers each header string per call, and these never
+# change between responses.
+_JSON_HEADERS = (b'Content-type: application/json\r\n'
+                 b'Access-Control-Allow-Origin: *\r\n')
+_OPTIONS_HEADERS = (b'Access-Control-Allow-Origin: *\r\n'
+                    b'Access-Control-Allow-Methods: GET, POST, PATCH, DELETE, OPTIONS\r\n'
+                    b'Access-Control-Allow-Headers: Content-Type\r\n'
+                    b'Content-Length: 0\r\n')
+
+
+# graph_data.json read cache, keyed on mtime: repeat GETs serve the
+# bytes from memory instead of re-reading and re-parsing the file.
+# The write path primes it, so the common case never stats stale.
+_graph_file_cache = {'mtime': None, 'bytes': None}
+# Request threads share the file and its cache; the lock keeps a writer
+# from interleaving with a reader's mtime check + byte fetch.
+_graph_file_lock = threading.Lock()
+
+
+# /api/projects response cache, gated on the projects-table version
+# probe: idle dashboard polls reuse the serialized bytes instead of
+# re-listing and re-encoding every row each second.
+_projects_cache = {'version': None, 'bytes': None}
+_projects_lock = threading.Lock()
+
+
+# /api/components/:id response cache, gated on the row's last_edited
+# stamp (a trigger bumps it on every component write): open-panel polls
+# reuse the serialized bytes until the component actually changes.
+_component_cache = {}  # id -> (last_edited, payload bytes)
+_component_lock = threading.Lock()
+_COMPONENT_CACHE_SIZE = 128
+
+
+# /api/agents response cache, gated on the Database's agent write
+# counter: the catalog changes only when an agent is registered or
+# updated, but the UI polls it like the other listings.
+_agents_cache = {'version': None, 'bytes': None}
+_agents_lock = threading.Lock()
+
+
+def _write_graph_file(path, data):
+    """Write graph_data.json and prime the read cache with its bytes."""
+    payload = _dump_json_file(data)
+    with _graph_file_lock:
+        with open(path, 'wb') as f:
+            f.write(payload)
+        _graph_file_cache['mtime'] = os.stat(path).st_mtime_ns
+        _graph_file_cache['bytes'] = payload
+
+# Single path setup for the whole process: makes db/api/agents importable
+# everywhere, so library modules don't each prepend to sys.path at import.
+_VISUAL_DIR = os.path.dirname(__file__)
+if _VISUAL_DIR not in sys.path:
+    sys.path.insert(0, _VISUAL_DIR)
 
 # Load environment variables from .env file
 try:
@@ -60,6 +193,11 @@ import shutil
 # Check if Claude Code CLI is available
 CLAUDE_CLI_AVAILABLE = shutil.which('claude') is not None
 
+# Launcher for the /open endpoint, resolved once: 'open' on macOS,
+# 'xdg-open' on other desktops. Resolving here skips a PATH search
+# per click and gives a clear error when no opener exists.
+OPENER_CMD = shutil.which('open' if sys.platform == 'darwin' else 'xdg-open')
+
 try:
     from db import Database
     from agents import InterviewerAgent, ArchitectAgent
@@ -80,9 +218,43 @@ except ImportError as e:
 # Import legacy agent logic as fallback
 import agent_logic
 
+
+@functools.lru_cache(maxsize=1)
+def _default_model() -> str:
+    """Resolve the configured model name once; /api/status polls reuse it."""
+    if USE_NEW_AGENTS:
+        try:
+            from agents.base_agent import AgentConfig
+            return AgentConfig().model
+        except Exception:
+            pass
+    return "claude-haiku-4-5-20251001"
+
+
+@functools.lru_cache(maxsize=1)
+def _status_payload() -> bytes:
+    """Pre-serialized /api/status body.
+
+    The fields are fixed once startup settles (agent mode, DB init, CLI
+    probe, model), and dashboards poll this endpoint aggressively, so
+    the bytes are built on the first hit and reused verbatim after.
+    """
+    return _dump_json_file({
+        'status': 'success',
+        'using_new_agents': USE_NEW_AGENTS,
+        'database_available': db is not None,
+        'cli_available': CLAUDE_CLI_AVAILABLE,
+        'model': _default_model(),
+    })
+
 PORT = 3842
 # We run this from dashboard/Visual, but the project root is 2 levels up
 PROJECT_ROOT = os.path.abspath(os.path.join(os.getcwd(), "../../"))
+# Symlink-resolved root for the /open containment check; resolved once
+# so per-request validation is pure string work plus one stat.
+_PROJECT_ROOT_REAL = os.path.realpath(PROJECT_ROOT)
+# Resolved once: the snapshot path shouldn't drift if cwd changes later.
+GRAPH_DATA_PATH = os.path.join(os.getcwd(), 'graph_data.json')
 
 print(f"Project Root determined as: {PROJECT_ROOT}")
 
@@ -95,315 +267,333 @@ if USE_NEW_AGENTS:
         api = APIHandler(db)
         print(f"[Server] Database initialized at: {db.db_path}")
     except Exception as e:
-        print(f"[Server] Database initialization failed: {e}")
-        traceback.print_exc()
+        logger.exception(f"[Server] Database initialization failed: {e}")
         USE_NEW_AGENTS = False
 
 
 class AgenticHandler(http.server.SimpleHTTPRequestHandler):
 
-    def do_POST(self):
-        """Handle API POST calls."""
-        parsed_path = urllib.parse.urlparse(self.path)
-
-        if parsed_path.path == '/api/start_interview':
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            try:
-                data = json.loads(post_data.decode('utf-8'))
-                user_prompt = data.get('prompt')
-                model = data.get('model')  # Optional model override
-
-                if not user_prompt:
-                    self.send_json({'status': 'error', 'message': 'No prompt provided'}, 400)
-                    return
-
-                print(f"[Server] Received prompt: {user_prompt[:100]}...")
-                if model:
-                    print(f"[Server] Using model: {model}")
+    # Persistent connections: the dashboard reuses one socket for its
+    # /api polling instead of a TCP handshake per call. Every response
+    # must then carry Content-Length (or Connection: close) so the
+    # client can find the body's end.
+    protocol_version = 'HTTP/1.1'
 
-                # Use new agents if available, otherwise fall back to legacy
-                if USE_NEW_AGENTS and db:
-                    graph_data, brief = self._run_new_interview(user_prompt, model=model)
-                    # Store brief in memory for refinement
-                    self._current_brief = brief
-                else:
-                    graph_data = agent_logic.generate_graph(user_prompt)
-                    self._current_brief = None
+    def copyfile(self, source, outputfile):
+        """Send static files with os.sendfile instead of a copy loop.
 
-                # Save to graph_data.json (legacy support for Graph.html)
-                output_path = os.path.join(os.getcwd(), 'graph_data.json')
-                with open(output_path, 'w') as f:
-                    json.dump(graph_data, f, indent=2)
+        The kernel moves the bytes from page cache to socket directly,
+        skipping the read()/write() round-trips through Python buffers.
+        Falls back to the stock copy when the source isn't a regular
+        file or the platform refuses (e.g. sendfile unsupported).
+        """
+        try:
+            in_fd = source.fileno()
+            out_fd = outputfile.fileno()
+            size = os.fstat(in_fd).st_size
+        except (AttributeError, OSError):
+            return super().copyfile(source, outputfile)
+        offset = 0
+        try:
+            while offset < size:
+                sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except OSError:
+            if offset:
+                raise  # partial transfer; can't restart cleanly
+            source.seek(0)
+            super().copyfile(source, outputfile)
+
+    def _read_json(self):
+        """Read and parse the JSON request body.
+
+        readinto() fills one preallocated buffer sized from
+        Content-Length, so the body isn't materialized a second time by
+        read() + decode() before parsing.
+        """
+        length = int(self.headers['Content-Length'])
+        buf = bytearray(length)
+        self.rfile.readinto(buf)
+        return _load_json(buf)
+
+    def _dispatch(self, routes):
+        """Match the request path against a compiled route table.
+
+        One anchored regex match per entry replaces the old cascade of
+        per-branch string compares and split('/') allocations; path
+        parameters arrive as named groups. Returns False when no route
+        matched so the caller picks the fallback (404 or static files).
+        """
+        path = urllib.parse.urlparse(self.path).path
+        for pattern, handler in routes:
+            m = pattern.match(path)
+            if m:
+                params = m.groupdict()
+                # Reject malformed IDs here, once, instead of paying a
+                # database round-trip per handler to say "not found".
+                if any(not _ID_RE.match(v) for v in params.values()):
+                    self.send_json({'status': 'error', 'message': 'Invalid id'}, 400)
+                    return True
+                handler(self, **params)
+                return True
+        return False
 
-                print(f"[Server] Graph data saved to {output_path}")
-                self.send_json({'status': 'success', 'data': graph_data})
+    def do_POST(self):
+        """Handle API POST calls."""
+        if not self._dispatch(self._POST_ROUTES):
+            self.send_error(404, "Endpoint not found")
 
-            except Exception as e:
-                print(f"[Server] Error processing interview: {e}")
-                traceback.print_exc()
-                self.send_json({'status': 'error', 'message': str(e)}, 500)
-            return
+    def _post_start_interview(self):
+        """POST /api/start_interview - run the interview and save the graph."""
+        try:
+            data = self._read_json()
+            user_prompt = data.get('prompt')
+            model = data.get('model')  # Optional model override
 
-        # Refine interview with answers to clarifying questions
-        if parsed_path.path == '/api/refine_interview':
-            if not USE_NEW_AGENTS or not db:
-                self.send_json({'status': 'error', 'message': 'LLM agents not available'}, 503)
+            if not user_prompt:
+                self.send_json({'status': 'error', 'message': 'No prompt provided'}, 400)
                 return
 
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            try:
-                data = json.loads(post_data.decode('utf-8'))
-                original_brief = data.get('brief')
-                answers = data.get('answers', {})
-                additional_context = data.get('additional_context', '')
-                model = data.get('model')  # Optional model override
-
-                if not original_brief:
-                    self.send_json({'status': 'error', 'message': 'No brief provided'}, 400)
-                    return
+            logger.info(f"[Server] Received prompt: {user_prompt[:100]}...")
+            if model:
+                logger.info(f"[Server] Using model: {model}")
 
-                print(f"[Server] Refining brief with {len(answers)} answers...")
-                if model:
-                    print(f"[Server] Using model: {model}")
+            # Use new agents if available, otherwise fall back to legacy
+            if USE_NEW_AGENTS and db:
+                graph_data, brief = self._run_new_interview(user_prompt, model=model)
+                # Store brief in memory for refinement
+                self._current_brief = brief
+            else:
+                graph_data = agent_logic.generate_graph(user_prompt)
+                self._current_brief = None
 
-                graph_data, refined_brief = self._refine_interview(original_brief, answers, additional_context, model=model)
-                self._current_brief = refined_brief
+            # Save to graph_data.json (legacy support for Graph.html)
+            _write_graph_file(GRAPH_DATA_PATH, graph_data)
 
-                # Save to graph_data.json
-                output_path = os.path.join(os.getcwd(), 'graph_data.json')
-                with open(output_path, 'w') as f:
-                    json.dump(graph_data, f, indent=2)
+            logger.info(f"[Server] Graph data saved to {GRAPH_DATA_PATH}")
+            self.send_json({'status': 'success', 'data': graph_data})
 
-                print(f"[Server] Refined graph data saved")
-                self.send_json({'status': 'success', 'data': graph_data})
+        except Exception as e:
+            logger.exception(f"[Server] Error processing interview: {e}")
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
 
-            except Exception as e:
-                print(f"[Server] Error refining interview: {e}")
-                traceback.print_exc()
-                self.send_json({'status': 'error', 'message': str(e)}, 500)
+    def _post_refine_interview(self):
+        """POST /api/refine_interview - refine with answers to clarifying questions."""
+        if not USE_NEW_AGENTS or not db:
+            self.send_json({'status': 'error', 'message': 'LLM agents not available'}, 503)
             return
 
-        # Generate architecture for a project
-        if parsed_path.path.startswith('/api/projects/') and parsed_path.path.endswith('/architecture'):
-            if not USE_NEW_AGENTS or not api:
-                self.send_json({'status': 'error', 'message': 'LLM agents not available'}, 503)
-                return
-
-            # Extract project_id from path: /api/projects/{id}/architecture
-            parts = parsed_path.path.split('/')
-            project_id = parts[3] if len(parts) >= 4 else None
-
-            if not project_id:
-                self.send_json({'status': 'error', 'message': 'Project ID required'}, 400)
+        try:
+            data = self._read_json()
+            original_brief = data.get('brief')
+            answers = data.get('answers', {})
+            additional_context = data.get('additional_context', '')
+            model = data.get('model')  # Optional model override
+
+            if not original_brief:
+                self.send_json({'status': 'error', 'message': 'No brief provided'}, 400)
                 return
 
-            content_length = int(self.headers.get('Content-Length', 0))
-            codebase_path = None
-            if content_length > 0:
-                post_data = self.rfile.read(content_length)
-                try:
-                    data = json.loads(post_data.decode('utf-8'))
-                    codebase_path = data.get('codebase_path')
-                except:
-                    pass
+            logger.info(f"[Server] Refining brief with {len(answers)} answers...")
+            if model:
+                logger.info(f"[Server] Using model: {model}")
 
-            print(f"[Server] Generating architecture for project {project_id}...")
-            result = api.generate_architecture(project_id, codebase_path)
-            self.send_json(result)
-            return
+            graph_data, refined_brief = self._refine_interview(original_brief, answers, additional_context, model=model)
+            self._current_brief = refined_brief
 
-        # Analyze a codebase
-        if parsed_path.path == '/api/analyze':
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            try:
-                data = json.loads(post_data.decode('utf-8'))
-                path = data.get('path')
+            # Save to graph_data.json
+            _write_graph_file(GRAPH_DATA_PATH, graph_data)
 
-                if not path:
-                    self.send_json({'status': 'error', 'message': 'Path required'}, 400)
-                    return
+            logger.info(f"[Server] Refined graph data saved")
+            self.send_json({'status': 'success', 'data': graph_data})
 
-                print(f"[Server] Analyzing codebase at {path}...")
-                result = api.analyze_codebase(path)
-                self.send_json(result)
+        except Exception as e:
+            logger.exception(f"[Server] Error refining interview: {e}")
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
 
-            except Exception as e:
-                print(f"[Server] Error analyzing codebase: {e}")
-                traceback.print_exc()
-                self.send_json({'status': 'error', 'message': str(e)}, 500)
+    def _post_architecture(self, project_id):
+        """POST /api/projects/:id/architecture - generate architecture."""
+        if not USE_NEW_AGENTS or not api:
+            self.send_json({'status': 'error', 'message': 'LLM agents not available'}, 503)
             return
 
-        # Component Chat - Conversational interface with change capabilities
-        if parsed_path.path == '/api/component/chat':
-            if not USE_NEW_AGENTS or not db:
-                self.send_json({'status': 'error', 'message': 'AI not available'}, 503)
-                return
-
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
+        codebase_path = None
+        if int(self.headers.get('Content-Length', 0)) > 0:
             try:
-                data = json.loads(post_data.decode('utf-8'))
-                component = data.get('component', {})
-                message = data.get('message', '')
-                history = data.get('history', [])
-                project_context = data.get('projectContext', '')
-                model = data.get('model')
-
-                print(f"[Server] Component chat: {message[:50]}...")
+                codebase_path = self._read_json().get('codebase_path')
+            except:
+                pass
 
-                result = self._component_chat(component, message, history, project_context, model)
-                self.send_json({'status': 'success', 'data': result})
+        logger.info(f"[Server] Generating architecture for project {project_id}...")
+        self.send_json_stream(api.generate_architecture_stream(project_id, codebase_path))
 
-            except Exception as e:
-                print(f"[Server] Component chat error: {e}")
-                traceback.print_exc()
-                self.send_json({'status': 'error', 'message': str(e)}, 500)
-            return
+    def _post_analyze(self):
+        """POST /api/analyze - analyze a codebase."""
+        try:
+            data = self._read_json()
+            path = data.get('path')
+            limit = data.get('limit')
 
-        # Component AI interaction - suggestions, questions, expansions (legacy)
-        if parsed_path.path == '/api/component/assist':
-            if not USE_NEW_AGENTS or not db:
-                self.send_json({'status': 'error', 'message': 'AI not available'}, 503)
+            if not path:
+                self.send_json({'status': 'error', 'message': 'Path required'}, 400)
                 return
 
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            try:
-                data = json.loads(post_data.decode('utf-8'))
-                component = data.get('component', {})
-                action = data.get('action', 'suggest')  # suggest, expand, question
-                user_input = data.get('input', '')
-                context = data.get('context', '')
-                model = data.get('model')
-
-                print(f"[Server] Component AI assist: {action}")
+            logger.info(f"[Server] Analyzing codebase at {path}...")
+            result = api.analyze_codebase(path, limit=limit)
+            self.send_json(result)
 
-                result = self._component_ai_assist(component, action, user_input, context, model)
-                self.send_json({'status': 'success', 'data': result})
+        except Exception as e:
+            logger.exception(f"[Server] Error analyzing codebase: {e}")
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
 
-            except Exception as e:
-                print(f"[Server] Component assist error: {e}")
-                traceback.print_exc()
-                self.send_json({'status': 'error', 'message': str(e)}, 500)
+    def _post_component_chat(self):
+        """POST /api/component/chat - conversational interface with change capabilities."""
+        if not USE_NEW_AGENTS or not db:
+            self.send_json({'status': 'error', 'message': 'AI not available'}, 503)
             return
 
-        # PRD Chat - AI assistant for refining component designs
-        if parsed_path.path == '/api/chat':
-            if not USE_NEW_AGENTS:
-                self.send_json({'status': 'error', 'message': 'AI not available'}, 503)
-                return
+        try:
+            data = self._read_json()
+            component = data.get('component', {})
+            message = data.get('message', '')
+            history = data.get('history', [])
+            project_context = data.get('projectContext', '')
+            model = data.get('model')
+
+            logger.info(f"[Server] Component chat: {message[:50]}...")
+
+            result = self._component_chat(component, message, history, project_context, model)
+            if isinstance(result, str):
+                # Already-valid model JSON: splice the bytes into the
+                # envelope instead of parsing and re-encoding the
+                # largest payload in the API.
+                self.send_json_bytes(b'{"status":"success","data":' + result.encode('utf-8') + b'}')
+            else:
+                self.send_json({'status': 'success', 'data': result})
 
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            try:
-                data = json.loads(post_data.decode('utf-8'))
-                message = data.get('message', '')
-                component = data.get('component', {})
-                section = data.get('section')  # Which PRD section is focused
-                history = data.get('history', [])
-                project_id = data.get('project_id')
-                component_id = component.get('id')
-
-                print(f"[Server] PRD Chat: {message[:50]}... (section: {section})")
-
-                # Save user message to database
-                if project_id and db:
-                    db.create_chat_message(
-                        project_id=project_id,
-                        role='user',
-                        content=message,
-                        component_id=component_id,
-                        section=section
-                    )
-
-                result = self._prd_chat(message, component, section, history)
-
-                # Save assistant response to database
-                if project_id and db and result.get('status') == 'success':
-                    db.create_chat_message(
-                        project_id=project_id,
-                        role='assistant',
-                        content=result.get('response', ''),
-                        component_id=component_id,
-                        section=section
-                    )
-
-                self.send_json(result)
+        except Exception as e:
+            logger.exception(f"[Server] Component chat error: {e}")
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
 
-            except Exception as e:
-                print(f"[Server] PRD Chat error: {e}")
-                traceback.print_exc()
-                self.send_json({'status': 'error', 'message': str(e)}, 500)
+    def _post_component_assist(self):
+        """POST /api/component/assist - suggestions, questions, expansions (legacy)."""
+        if not USE_NEW_AGENTS or not db:
+            self.send_json({'status': 'error', 'message': 'AI not available'}, 503)
             return
 
-        # Approve design and advance phase (also triggers GM if moving to planning phase)
-        if parsed_path.path.startswith('/api/projects/') and parsed_path.path.endswith('/approve'):
-            if not USE_NEW_AGENTS or not api:
-                self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
-                return
-
-            parts = parsed_path.path.split('/')
-            project_id = parts[3] if len(parts) >= 4 else None
+        try:
+            data = self._read_json()
+            component = data.get('component', {})
+            action = data.get('action', 'suggest')  # suggest, expand, question
+            user_input = data.get('input', '')
+            context = data.get('context', '')
+            model = data.get('model')
+
+            logger.info(f"[Server] Component AI assist: {action}")
+
+            result = self._component_ai_assist(component, action, user_input, context, model)
+            if isinstance(result, str):
+                # Already-valid model JSON: splice the bytes in verbatim
+                self.send_json_bytes(b'{"status":"success","data":' + result.encode('utf-8') + b'}')
+            else:
+                self.send_json({'status': 'success', 'data': result})
 
-            if not project_id:
-                self.send_json({'status': 'error', 'message': 'Project ID required'}, 400)
-                return
+        except Exception as e:
+            logger.exception(f"[Server] Component assist error: {e}")
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
 
-            print(f"[Server] Approving design for project {project_id}...")
-            result = api.approve_design(project_id)
+    def _post_chat(self):
+        """POST /api/chat - AI assistant for refining component designs (PRD chat)."""
+        if not USE_NEW_AGENTS:
+            self.send_json({'status': 'error', 'message': 'AI not available'}, 503)
+            return
 
-            # If advancing to planning phase, also run GM agent
-            if result.get('status') == 'success' and result.get('new_phase') == 'planning':
-                try:
-                    print(f"[Server] Auto-triggering GM phase...")
-                    from agents import GeneralManagerAgent
-                    gm = GeneralManagerAgent(db)
-                    work_plan = gm.execute(project_id)
-                    result['work_plan'] = work_plan
-                    result['gm_status'] = 'success'
-                except Exception as e:
-                    print(f"[Server] GM phase error: {e}")
-                    traceback.print_exc()
-                    result['gm_status'] = 'error'
-                    result['gm_error'] = str(e)
+        try:
+            data = self._read_json()
+            message = data.get('message', '')
+            component = data.get('component', {})
+            section = data.get('section')  # Which PRD section is focused
+            history = data.get('history', [])
+            project_id = data.get('project_id')
+            component_id = component.get('id')
+
+            logger.info(f"[Server] PRD Chat: {message[:50]}... (section: {section})")
+
+            # Save user message to database
+            if project_id and db:
+                db.create_chat_message(
+                    project_id=project_id,
+                    role='user',
+                    content=message,
+                    component_id=component_id,
+                    section=section
+                )
+
+            result = self._prd_chat(message, component, section, history)
+
+            # Save assistant response to database
+            if project_id and db and result.get('status') == 'success':
+                db.create_chat_message(
+                    project_id=project_id,
+                    role='assistant',
+                    content=result.get('response', ''),
+                    component_id=component_id,
+                    section=section
+                )
 
             self.send_json(result)
-            return
 
-        # Start GM phase - create build plans for all components
-        if parsed_path.path.startswith('/api/projects/') and parsed_path.path.endswith('/start-gm'):
-            if not USE_NEW_AGENTS or not db:
-                self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
-                return
+        except Exception as e:
+            logger.exception(f"[Server] PRD Chat error: {e}")
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
 
-            parts = parsed_path.path.split('/')
-            project_id = parts[3] if len(parts) >= 4 else None
+    def _post_approve(self, project_id):
+        """POST /api/projects/:id/approve - approve design, advance phase, trigger GM."""
+        if not USE_NEW_AGENTS or not api:
+            self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
+            return
 
-            if not project_id:
-                self.send_json({'status': 'error', 'message': 'Project ID required'}, 400)
-                return
+        logger.info(f"[Server] Approving design for project {project_id}...")
+        result = api.approve_design(project_id)
 
+        # If advancing to planning phase, also run GM agent
+        if result.get('status') == 'success' and result.get('new_phase') == 'planning':
             try:
-                print(f"[Server] Starting GM phase for project {project_id}...")
+                logger.info(f"[Server] Auto-triggering GM phase...")
                 from agents import GeneralManagerAgent
                 gm = GeneralManagerAgent(db)
                 work_plan = gm.execute(project_id)
-
-                self.send_json({
-                    'status': 'success',
-                    'message': 'GM phase complete',
-                    'work_plan': work_plan
-                })
+                result['work_plan'] = work_plan
+                result['gm_status'] = 'success'
             except Exception as e:
-                print(f"[Server] GM phase error: {e}")
-                traceback.print_exc()
-                self.send_json({'status': 'error', 'message': str(e)}, 500)
+                logger.exception(f"[Server] GM phase error: {e}")
+                result['gm_status'] = 'error'
+                result['gm_error'] = str(e)
+
+        self.send_json(result)
+
+    def _post_start_gm(self, project_id):
+        """POST /api/projects/:id/start-gm - create build plans for all components."""
+        if not USE_NEW_AGENTS or not db:
+            self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
             return
 
-        self.send_error(404, "Endpoint not found")
+        try:
+            logger.info(f"[Server] Starting GM phase for project {project_id}...")
+            from agents import GeneralManagerAgent
+            gm = GeneralManagerAgent(db)
+            work_plan = gm.execute(project_id)
+
+            self.send_json({
+                'status': 'success',
+                'message': 'GM phase complete',
+                'work_plan': work_plan
+            })
+        except Exception as e:
+            logger.exception(f"[Server] GM phase error: {e}")
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
 
     def _run_new_interview(self, user_prompt: str, model: str = None) -> tuple:
         """Run interview using new LLM-powered agents."""
@@ -428,8 +618,12 @@ class AgenticHandler(http.server.SimpleHTTPRequestHandler):
 
         return graph_data, refined_brief
 
-    def _component_chat(self, component: dict, message: str, history: list, project_context: str, model: str = None) -> dict:
-        """Conversational chat interface for component refinement."""
+    def _component_chat(self, component: dict, message: str, history: list, project_context: str, model: str = None):
+        """Conversational chat interface for component refinement.
+
+        Returns validated model JSON as text (for verbatim passthrough)
+        or a plain dict for the fallback and error cases.
+        """
         from agents.base_agent import AgentConfig
         import subprocess
 
@@ -445,18 +639,18 @@ SUMMARY: {component.get('summary', 'No summary yet')}
 
 PROBLEM: {component.get('problem', 'Not defined')}
 
-GOALS: {json.dumps(component.get('goals', []))}
+GOALS: {_dump_json_str(component.get('goals', []))}
 
-SCOPE: {json.dumps(component.get('scope', []))}
+SCOPE: {_dump_json_str(component.get('scope', []))}
 
-REQUIREMENTS: {json.dumps(component.get('requirements', []))}
+REQUIREMENTS: {_dump_json_str(component.get('requirements', []))}
 
-RISKS: {json.dumps(component.get('risks', []))}
+RISKS: {_dump_json_str(component.get('risks', []))}
 
-TEST CASES: {json.dumps([tc.get('name', tc) if isinstance(tc, dict) else tc for tc in component.get('testCases', [])])}
+TEST CASES: {_dump_json_str([tc.get('name', tc) if isinstance(tc, dict) else tc for tc in component.get('testCases', [])])}
 
-INPUTS: {json.dumps(component.get('inputs', []))}
-OUTPUTS: {json.dumps(component.get('outputs', []))}
+INPUTS: {_dump_json_str(component.get('inputs', []))}
+OUTPUTS: {_dump_json_str(component.get('outputs', []))}
 """
 
         # Build conversation history
@@ -465,6 +659,45 @@ OUTPUTS: {json.dumps(component.get('outputs', []))}
             role = "User" if h.get('type') == 'user' else "Assistant"
             history_text += f"{role}: {h.get('content', '')}\n"
 
+        # Question-only messages (no change verb) skip the JSON
+        # envelope: the model answers in plain text, so it doesn't spend
+        # tokens encoding JSON and we don't parse the changes schema.
+        if not _CHANGE_KW.search(message):
+            prompt = f"""You are a helpful technical architect assistant having a conversation about a software component.
+
+PROJECT CONTEXT: {project_context}
+
+{comp_info}
+
+CONVERSATION HISTORY:
+{history_text}
+
+USER'S MESSAGE: {message}
+
+INSTRUCTIONS:
+1. Respond conversationally and helpfully to the user's message
+2. If they ask for explanations, provide clear, detailed answers
+3. Always be specific and actionable
+4. Use HTML formatting (<strong>, <em>, <ul>, <li>) for readability
+
+Respond directly with the answer text. Do not use JSON."""
+
+            try:
+                full_prompt = f"System: You are a helpful technical assistant.\n\nUser: {prompt}"
+                cmd = ['claude', '-p', full_prompt, '--dangerously-skip-permissions']
+                if config.model:
+                    cmd.extend(['--model', config.model])
+
+                result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=90)
+                return {"response": result.stdout.strip(), "changes": {}}
+
+            except subprocess.TimeoutExpired:
+                return {"response": "Sorry, the request timed out. Please try again.", "error": "timeout"}
+            except subprocess.CalledProcessError as e:
+                return {"response": f"Sorry, I encountered an error: {e.stderr[:200]}", "error": str(e)}
+            except Exception as e:
+                return {"response": f"An error occurred: {str(e)}", "error": str(e)}
+
         prompt = f"""You are a helpful technical architect assistant having a conversation about a software component.
 
 PROJECT CONTEXT: {project_context}
@@ -516,15 +749,9 @@ Return ONLY valid JSON."""
             result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=90)
             response = result.stdout.strip()
 
-            # Parse JSON from response
-            import re
-            try:
-                return json.loads(response)
-            except:
-                json_match = re.search(r'\{[\s\S]*\}', response)
-                if json_match:
-                    return json.loads(json_match.group())
-
+            raw = _extract_llm_json(response)
+            if raw is not None:
+                return raw  # validated JSON text, forwarded verbatim
             return {"response": response, "changes": {}}
 
         except subprocess.TimeoutExpired:
@@ -534,8 +761,12 @@ Return ONLY valid JSON."""
         except Exception as e:
             return {"response": f"An error occurred: {str(e)}", "error": str(e)}
 
-    def _component_ai_assist(self, component: dict, action: str, user_input: str, context: str, model: str = None) -> dict:
-        """Provide AI assistance for a specific component."""
+    def _component_ai_assist(self, component: dict, action: str, user_input: str, context: str, model: str = None):
+        """Provide AI assistance for a specific component.
+
+        Returns validated model JSON as text (for verbatim passthrough)
+        or a plain dict for the fallback and error cases.
+        """
         from agents.base_agent import AgentConfig
         import subprocess
 
@@ -623,17 +854,9 @@ Return ONLY valid JSON."""
             result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=60)
             response = result.stdout.strip()
 
-            # Parse JSON from response
-            import re
-            # Try direct parse
-            try:
-                return json.loads(response)
-            except:
-                # Try to extract JSON
-                json_match = re.search(r'\{[\s\S]*\}', response)
-                if json_match:
-                    return json.loads(json_match.group())
-
+            raw = _extract_llm_json(response)
+            if raw is not None:
+                return raw  # validated JSON text, forwarded verbatim
             return {"answer": response, "raw": True}
 
         except subprocess.TimeoutExpired:
@@ -728,321 +951,440 @@ Respond directly and helpfully. Do not use JSON format - just natural text with
         except Exception as e:
             return {'status': 'error', 'response': f'Error: {str(e)}'}
 
+    def _query(self):
+        """Parse the query string of the current request into a dict."""
+        return urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+
     def do_GET(self):
         """Handle API GET calls."""
-        parsed_path = urllib.parse.urlparse(self.path)
+        if not self._dispatch(self._GET_ROUTES):
+            # Default static file serving
+            super().do_GET()
 
-        # Get graph data (legacy endpoint)
-        if parsed_path.path == '/api/graph_data':
-            data_path = os.path.join(os.getcwd(), 'graph_data.json')
-            if os.path.exists(data_path):
-                try:
-                    with open(data_path, 'r') as f:
-                        data = json.load(f)
-                    self.send_json(data)
-                except Exception as e:
-                    self.send_json({'status': 'error', 'message': str(e)}, 500)
-            else:
-                self.send_json({'status': 'error', 'message': 'No graph data found. Run interview first.'}, 404)
+    def _get_graph_data(self):
+        """GET /api/graph_data - serve the legacy graph snapshot."""
+        try:
+            mtime = os.stat(GRAPH_DATA_PATH).st_mtime_ns
+        except OSError:
+            self.send_json({'status': 'error', 'message': 'No graph data found. Run interview first.'}, 404)
             return
+        try:
+            with _graph_file_lock:
+                if _graph_file_cache['mtime'] != mtime:
+                    with open(GRAPH_DATA_PATH, 'rb') as f:
+                        _graph_file_cache['bytes'] = f.read()
+                    _graph_file_cache['mtime'] = mtime
+                payload = _graph_file_cache['bytes']
+            self.send_json_etag(payload, str(mtime))
+        except Exception as e:
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
 
-        # List all projects
-        if parsed_path.path == '/api/projects':
-            if USE_NEW_AGENTS and db:
-                try:
-                    projects = db.get_all_projects()
-                    self.send_json({
-                        'status': 'success',
-                        'projects': [p.to_dict() for p in projects]
-                    })
-                except Exception as e:
-                    self.send_json({'status': 'error', 'message': str(e)}, 500)
-            else:
-                self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
-            return
+    def _get_projects(self):
+        """GET /api/projects - list all projects."""
+        if USE_NEW_AGENTS and db:
+            try:
+                version = db.get_projects_version()
+                with _projects_lock:
+                    if _projects_cache['version'] != version:
+                        projects = db.get_all_projects()
+                        _projects_cache['bytes'] = _dump_json_file({
+                            'status': 'success',
+                            'projects': [p.to_dict() for p in projects]
+                        })
+                        _projects_cache['version'] = version
+                    payload = _projects_cache['bytes']
+                self.send_json_etag(payload, version)
+            except Exception as e:
+                self.send_json({'status': 'error', 'message': str(e)}, 500)
+        else:
+            self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
 
-        # Get specific project graph data (legacy endpoint)
-        if parsed_path.path.startswith('/api/project/') and not '/graph' in parsed_path.path:
-            project_id = parsed_path.path.split('/')[-1]
-            if USE_NEW_AGENTS and db:
-                try:
-                    graph_data = db.get_graph_data(project_id)
-                    if graph_data:
-                        self.send_json({'status': 'success', 'data': graph_data})
-                    else:
-                        self.send_json({'status': 'error', 'message': 'Project not found'}, 404)
-                except Exception as e:
-                    self.send_json({'status': 'error', 'message': str(e)}, 500)
-            else:
-                self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
-            return
+    def _get_project_legacy(self, project_id):
+        """GET /api/project/:id - project graph data (legacy endpoint)."""
+        if USE_NEW_AGENTS and db:
+            try:
+                graph_data = db.get_graph_data(project_id)
+                if graph_data:
+                    self.send_json({'status': 'success', 'data': graph_data})
+                else:
+                    self.send_json({'status': 'error', 'message': 'Project not found'}, 404)
+            except Exception as e:
+                self.send_json({'status': 'error', 'message': str(e)}, 500)
+        else:
+            self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
 
-        # New API: Get project graph data (Phase 2)
-        if parsed_path.path.startswith('/api/projects/') and parsed_path.path.endswith('/graph'):
-            parts = parsed_path.path.split('/')
-            project_id = parts[3] if len(parts) >= 4 else None
-            if USE_NEW_AGENTS and api:
-                try:
-                    graph_data = api.get_project_graph(project_id)
-                    if graph_data:
+    def _get_project_graph(self, project_id):
+        """GET /api/projects/:id/graph - project graph data (Phase 2)."""
+        if USE_NEW_AGENTS and api:
+            try:
+                query = self._query()
+                if 'fields' in query:
+                    # Partial payload (e.g. ?fields=nodes,edges): skips
+                    # the queries for the sections not requested.
+                    fields = {f for f in query['fields'][0].split(',') if f}
+                    graph_data = api.get_project_graph(project_id, fields)
+                    if graph_data is not None:
                         self.send_json(graph_data)
                     else:
                         self.send_json({'status': 'error', 'message': 'Project not found'}, 404)
-                except Exception as e:
-                    self.send_json({'status': 'error', 'message': str(e)}, 500)
-            else:
-                self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
-            return
+                    return
+                graph_chunks = api.iter_project_graph_json(project_id)
+                if graph_chunks is not None:
+                    self.send_json_stream(graph_chunks)
+                else:
+                    self.send_json({'status': 'error', 'message': 'Project not found'}, 404)
+            except Exception as e:
+                self.send_json({'status': 'error', 'message': str(e)}, 500)
+        else:
+            self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
 
-        # Get component details
-        if parsed_path.path.startswith('/api/components/') and not '/chat' in parsed_path.path:
-            component_id = parsed_path.path.split('/')[-1]
-            if USE_NEW_AGENTS and api:
-                try:
+    def _get_component(self, component_id):
+        """GET /api/components/:id - component details."""
+        if USE_NEW_AGENTS and api:
+            try:
+                version = db.get_component_version(component_id)
+                if version is None:
+                    self.send_json({'status': 'error', 'message': 'Component not found'}, 404)
+                    return
+                with _component_lock:
+                    cached = _component_cache.get(component_id)
+                    payload = cached[1] if cached and cached[0] == version else None
+                if payload is None:
                     comp_data = api.get_component(component_id)
-                    if comp_data:
-                        self.send_json(comp_data)
-                    else:
+                    if not comp_data:
                         self.send_json({'status': 'error', 'message': 'Component not found'}, 404)
-                except Exception as e:
-                    self.send_json({'status': 'error', 'message': str(e)}, 500)
-            else:
-                self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
+                        return
+                    payload = _dump_json_file(comp_data)
+                    with _component_lock:
+                        if len(_component_cache) >= _COMPONENT_CACHE_SIZE:
+                            # Drop the oldest insertion; dicts keep order
+                            _component_cache.pop(next(iter(_component_cache)))
+                        _component_cache[component_id] = (version, payload)
+                self.send_json_etag(payload, f'{component_id}|{version}')
+            except Exception as e:
+                self.send_json({'status': 'error', 'message': str(e)}, 500)
+        else:
+            self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
+
+    def _get_chat_history(self):
+        """GET /api/chat/history?project_id=xxx&component_id=yyy - chat history."""
+        if not USE_NEW_AGENTS or not db:
+            self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
             return
 
-        # Get chat history for a component
-        # Format: /api/chat/history?project_id=xxx&component_id=yyy
-        if parsed_path.path == '/api/chat/history':
-            if not USE_NEW_AGENTS or not db:
-                self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
-                return
+        query = self._query()
+        project_id = query.get('project_id', [None])[0]
+        component_id = query.get('component_id', [None])[0]
 
-            query = urllib.parse.parse_qs(parsed_path.query)
-            project_id = query.get('project_id', [None])[0]
-            component_id = query.get('component_id', [None])[0]
+        if not project_id:
+            self.send_json({'status': 'error', 'message': 'project_id required'}, 400)
+            return
 
-            if not project_id:
-                self.send_json({'status': 'error', 'message': 'project_id required'}, 400)
-                return
+        try:
+            messages = db.get_chat_history(project_id, component_id)
+            self.send_json({
+                'status': 'success',
+                'history': [m.to_chat_format() for m in messages]
+            })
+        except Exception as e:
+            logger.info(f"[Server] Chat history error: {e}")
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
 
-            try:
-                messages = db.get_chat_history(project_id, component_id)
-                self.send_json({
-                    'status': 'success',
-                    'history': [m.to_chat_format() for m in messages]
-                })
-            except Exception as e:
-                print(f"[Server] Chat history error: {e}")
-                self.send_json({'status': 'error', 'message': str(e)}, 500)
+    def _get_work_plan(self, project_id):
+        """GET /api/projects/:id/work-plan - project work plan."""
+        if not USE_NEW_AGENTS or not db:
+            self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
             return
 
-        # Get work plan for a project
-        if parsed_path.path.startswith('/api/projects/') and parsed_path.path.endswith('/work-plan'):
-            if not USE_NEW_AGENTS or not db:
-                self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
+        try:
+            project = db.get_project(project_id)
+            if not project:
+                self.send_json({'status': 'error', 'message': 'Project not found'}, 404)
                 return
 
-            parts = parsed_path.path.split('/')
-            project_id = parts[3] if len(parts) >= 4 else None
+            work_plan = project.work_plan
+            if work_plan:
+                try:
+                    work_plan = _load_json(work_plan)
+                except:
+                    pass
 
-            if not project_id:
-                self.send_json({'status': 'error', 'message': 'Project ID required'}, 400)
-                return
+            self.send_json({
+                'status': 'success',
+                'work_plan': work_plan
+            })
+        except Exception as e:
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
 
+    def _get_agents(self):
+        """GET /api/agents - list all agents."""
+        if USE_NEW_AGENTS and api:
             try:
-                project = db.get_project(project_id)
-                if not project:
-                    self.send_json({'status': 'error', 'message': 'Project not found'}, 404)
-                    return
-
-                work_plan = project.work_plan
-                if work_plan:
-                    try:
-                        work_plan = json.loads(work_plan)
-                    except:
-                        pass
-
-                self.send_json({
-                    'status': 'success',
-                    'work_plan': work_plan
-                })
+                version = db.get_agents_version()
+                with _agents_lock:
+                    if _agents_cache['version'] != version:
+                        _agents_cache['bytes'] = _dump_json_file(api.get_agents())
+                        _agents_cache['version'] = version
+                    payload = _agents_cache['bytes']
+                self.send_json_etag(payload, f'agents|{version}')
             except Exception as e:
                 self.send_json({'status': 'error', 'message': str(e)}, 500)
-            return
+        else:
+            self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
 
-        # Get all agents
-        if parsed_path.path == '/api/agents':
-            if USE_NEW_AGENTS and api:
-                try:
-                    self.send_json(api.get_agents())
-                except Exception as e:
-                    self.send_json({'status': 'error', 'message': str(e)}, 500)
-            else:
-                self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
+    def _get_open(self):
+        """GET /open?path=... - open a file in the default editor."""
+        file_path = self._query().get('path', [None])[0]
+
+        if not file_path:
+            self.send_json({'status': 'error', 'message': 'No path provided'}, 400)
             return
 
-        # Open file in default editor
-        if parsed_path.path == '/open':
-            query = urllib.parse.parse_qs(parsed_path.query)
-            file_path = query.get('path', [None])[0]
+        # Check if it is already absolute
+        if file_path.startswith('/'):
+            full_path = file_path
+        else:
+            full_path = os.path.join(PROJECT_ROOT, file_path)
 
-            if file_path:
-                # Check if it is already absolute
-                if file_path.startswith('/'):
-                    full_path = file_path
-                else:
-                    full_path = os.path.join(PROJECT_ROOT, file_path)
-
-                print(f"[Server] Request to open: {full_path}")
-
-                if os.path.exists(full_path):
-                    try:
-                        # Use 'open' command on Mac which opens in default app
-                        subprocess.run(['open', full_path])
-                        self.send_json({'status': 'success', 'message': f'Opened {full_path}'})
-                    except Exception as e:
-                        print(f"[Server] Error executing open: {e}")
-                        self.send_json({'status': 'error', 'message': str(e)}, 500)
-                else:
-                    print(f"[Server] File not found: {full_path}")
-                    self.send_json({'status': 'error', 'message': 'File not found'}, 404)
-            else:
-                self.send_json({'status': 'error', 'message': 'No path provided'}, 400)
-            return
+        logger.info(f"[Server] Request to open: {full_path}")
 
-        # API status endpoint
-        if parsed_path.path == '/api/status':
-            # Get model from config
-            model_name = "claude-haiku-4-5-20251001"  # Default
-            if USE_NEW_AGENTS:
-                try:
-                    from agents.base_agent import AgentConfig
-                    model_name = AgentConfig().model
-                except:
-                    pass
+        # Resolve symlinks before the containment check so neither an
+        # absolute path nor a link inside the tree can point the opener
+        # at a file outside the project root.
+        full_path = os.path.realpath(full_path)
+        if os.path.commonpath([_PROJECT_ROOT_REAL, full_path]) != _PROJECT_ROOT_REAL:
+            logger.info(f"[Server] Refusing path outside project root: {full_path}")
+            self.send_json({'status': 'error', 'message': 'Path outside project root'}, 403)
+            return
 
-            self.send_json({
-                'status': 'success',
-                'using_new_agents': USE_NEW_AGENTS,
-                'database_available': db is not None,
-                'cli_available': CLAUDE_CLI_AVAILABLE,
-                'model': model_name
-            })
+        try:
+            os.stat(full_path)  # one stat replaces the old exists() probe
+        except OSError:
+            logger.info(f"[Server] File not found: {full_path}")
+            self.send_json({'status': 'error', 'message': 'File not found'}, 404)
             return
 
-        # Default static file serving
-        return super().do_GET()
+        try:
+            if OPENER_CMD is None:
+                raise OSError('No file opener found on this platform')
+            # Don't block the response on the launcher: it hands the
+            # file to the default app and the HTTP reply returns
+            # immediately. A daemon thread waits on the child so it is
+            # reaped as soon as it exits instead of sitting as a zombie
+            # until the next spawn (Popen's lazy cleanup).
+            proc = subprocess.Popen([OPENER_CMD, full_path])
+            threading.Thread(target=proc.wait, daemon=True).start()
+            self.send_json({'status': 'success', 'message': f'Opened {full_path}'})
+        except Exception as e:
+            logger.info(f"[Server] Error executing open: {e}")
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
+
+    def _get_status(self):
+        """GET /api/status - server status."""
+        payload = _status_payload()
+        self.send_json_etag(payload, payload)
 
     def do_PATCH(self):
         """Handle API PATCH calls for updates."""
-        parsed_path = urllib.parse.urlparse(self.path)
-
-        # Update component
-        if parsed_path.path.startswith('/api/components/'):
-            if not USE_NEW_AGENTS or not api:
-                self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
-                return
+        if not self._dispatch(self._PATCH_ROUTES):
+            self.send_error(404, "Endpoint not found")
 
-            component_id = parsed_path.path.split('/')[-1]
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-
-            try:
-                updates = json.loads(post_data.decode('utf-8'))
-                result = api.update_component(component_id, updates)
-                self.send_json(result)
-            except Exception as e:
-                self.send_json({'status': 'error', 'message': str(e)}, 500)
+    def _patch_component(self, component_id):
+        """PATCH /api/components/:id - update a component."""
+        if not USE_NEW_AGENTS or not api:
+            self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
             return
 
-        # Update project
-        if parsed_path.path.startswith('/api/projects/'):
-            if not USE_NEW_AGENTS or not api:
-                self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
-                return
-
-            project_id = parsed_path.path.split('/')[-1]
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
+        try:
+            updates = self._read_json()
+            result = api.update_component(component_id, updates)
+            self.send_json(result)
+        except Exception as e:
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
 
-            try:
-                updates = json.loads(post_data.decode('utf-8'))
-                result = api.update_project(project_id, updates)
-                self.send_json(result)
-            except Exception as e:
-                self.send_json({'status': 'error', 'message': str(e)}, 500)
+    def _patch_project(self, project_id):
+        """PATCH /api/projects/:id - update a project."""
+        if not USE_NEW_AGENTS or not api:
+            self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
             return
 
-        self.send_error(404, "Endpoint not found")
+        try:
+            updates = self._read_json()
+            result = api.update_project(project_id, updates)
+            self.send_json(result)
+        except Exception as e:
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
 
     def do_DELETE(self):
         """Handle API DELETE calls."""
-        parsed_path = urllib.parse.urlparse(self.path)
-
-        # Delete project
-        if parsed_path.path.startswith('/api/projects/'):
-            if not USE_NEW_AGENTS or not db:
-                self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
-                return
+        if not self._dispatch(self._DELETE_ROUTES):
+            self.send_error(404, "Endpoint not found")
 
-            project_id = parsed_path.path.split('/')[-1]
-            try:
-                success = db.delete_project(project_id)
-                if success:
-                    print(f"[Server] Deleted project: {project_id}")
-                    self.send_json({'status': 'success', 'message': 'Project deleted'})
-                else:
-                    self.send_json({'status': 'error', 'message': 'Project not found'}, 404)
-            except Exception as e:
-                print(f"[Server] Error deleting project: {e}")
-                self.send_json({'status': 'error', 'message': str(e)}, 500)
+    def _delete_project(self, project_id):
+        """DELETE /api/projects/:id - delete a project."""
+        if not USE_NEW_AGENTS or not db:
+            self.send_json({'status': 'error', 'message': 'Database not available'}, 503)
             return
 
-        self.send_error(404, "Endpoint not found")
+        try:
+            success = db.delete_project(project_id)
+            if success:
+                logger.info(f"[Server] Deleted project: {project_id}")
+                self.send_json({'status': 'success', 'message': 'Project deleted'})
+            else:
+                self.send_json({'status': 'error', 'message': 'Project not found'}, 404)
+        except Exception as e:
+            logger.info(f"[Server] Error deleting project: {e}")
+            self.send_json({'status': 'error', 'message': str(e)}, 500)
 
     def do_OPTIONS(self):
         """Handle CORS preflight requests."""
-        self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PATCH, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
+        self._write_response(200, _OPTIONS_HEADERS + b'\r\n')
+
+    def _write_response(self, code, headers, body=b''):
+        """Emit a whole response with one wfile.write.
+
+        The status line and Server/Date headers are formatted here and
+        joined with the precomputed fixed-header bytes and the body, so
+        a response costs one syscall and no per-header send_header
+        formatting. Request logging matches send_response.
+        """
+        self.log_request(code)
+        phrase = self.responses[code][0] if code in self.responses else ''
+        head = (f'{self.protocol_version} {code} {phrase}\r\n'
+                f'Server: {self.version_string()}\r\n'
+                f'Date: {self.date_time_string()}\r\n').encode('latin-1')
+        self.wfile.write(head + headers + body)
+
+    def send_json_bytes(self, payload, code=200):
+        """Send a response body that is already serialized JSON bytes."""
+        headers = _JSON_HEADERS + f'Content-Length: {len(payload)}\r\n\r\n'.encode('latin-1')
+        self._write_response(code, headers, payload)
+
+    def send_json_etag(self, payload, version):
+        """Send cached JSON bytes with an ETag derived from a version.
+
+        When the client's If-None-Match matches, reply 304 with no body
+        — the poll skips the transfer entirely and reuses its cached
+        copy. The version is crc32-hashed so timestamps and separators
+        stay within the characters an ETag allows.
+        """
+        if isinstance(version, str):
+            version = version.encode('utf-8')
+        etag = f'"{zlib.crc32(version):08x}"'
+        if self.headers.get('If-None-Match') == etag:
+            self._write_response(304, (f'ETag: {etag}\r\n'
+                                       f'Access-Control-Allow-Origin: *\r\n'
+                                       f'Content-Length: 0\r\n\r\n').encode('latin-1'))
+            return
+        headers = (_JSON_HEADERS
+                   + f'ETag: {etag}\r\nContent-Length: {len(payload)}\r\n\r\n'.encode('latin-1'))
+        self._write_response(200, headers, payload)
 
-    def send_json(self, data, code=200):
-        """Send a JSON response."""
+    def send_json_stream(self, chunks, code=200):
+        """Send a JSON response from an iterator of byte chunks.
+
+        Chunked transfer encoding frames each fragment, so the body
+        flushes as it is produced and the connection stays reusable
+        afterwards instead of being closed to mark the body's end.
+        """
         self.send_response(code)
         self.send_header('Content-type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')  # Allow CORS
+        self.send_header('Transfer-Encoding', 'chunked')
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode('utf-8'))
-
+        try:
+            for chunk in chunks:
+                if chunk:
+                    self.wfile.write(f'{len(chunk):x}\r\n'.encode('latin-1')
+                                     + chunk + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+        except Exception:
+            # Mid-stream failure: there is no way to send a valid
+            # terminator now, so drop the connection to signal
+            # truncation to the client.
+            self.close_connection = True
+            raise
 
-# Reuse address to prevent "Address already in use" on restarts
-socketserver.TCPServer.allow_reuse_address = True
+    def send_json(self, data, code=200):
+        """Send a JSON response."""
+        if orjson is not None:
+            body = orjson.dumps(data)
+        else:
+            body = json.dumps(data).encode('utf-8')
+        self.send_json_bytes(body, code)
+
+    # Route tables, compiled once at class-definition time. Entries are
+    # (anchored pattern, handler); named groups become handler keyword
+    # arguments, so `[^/]+` segments double as the non-empty ID check
+    # the old branches did by hand.
+    _POST_ROUTES = [
+        (re.compile(r'^/api/start_interview$'), _post_start_interview),
+        (re.compile(r'^/api/refine_interview$'), _post_refine_interview),
+        (re.compile(r'^/api/projects/(?P<project_id>[^/]+)/architecture$'), _post_architecture),
+        (re.compile(r'^/api/analyze$'), _post_analyze),
+        (re.compile(r'^/api/component/chat$'), _post_component_chat),
+        (re.compile(r'^/api/component/assist$'), _post_component_assist),
+        (re.compile(r'^/api/chat$'), _post_chat),
+        (re.compile(r'^/api/projects/(?P<project_id>[^/]+)/approve$'), _post_approve),
+        (re.compile(r'^/api/projects/(?P<project_id>[^/]+)/start-gm$'), _post_start_gm),
+    ]
+
+    _GET_ROUTES = [
+        (re.compile(r'^/api/graph_data$'), _get_graph_data),
+        (re.compile(r'^/api/projects$'), _get_projects),
+        (re.compile(r'^/api/project/(?P<project_id>[^/]+)$'), _get_project_legacy),
+        (re.compile(r'^/api/projects/(?P<project_id>[^/]+)/graph$'), _get_project_graph),
+        (re.compile(r'^/api/components/(?P<component_id>[^/]+)$'), _get_component),
+        (re.compile(r'^/api/chat/history$'), _get_chat_history),
+        (re.compile(r'^/api/projects/(?P<project_id>[^/]+)/work-plan$'), _get_work_plan),
+        (re.compile(r'^/api/agents$'), _get_agents),
+        (re.compile(r'^/open$'), _get_open),
+        (re.compile(r'^/api/status$'), _get_status),
+    ]
+
+    _PATCH_ROUTES = [
+        (re.compile(r'^/api/components/(?P<component_id>[^/]+)$'), _patch_component),
+        (re.compile(r'^/api/projects/(?P<project_id>[^/]+)$'), _patch_project),
+    ]
+
+    _DELETE_ROUTES = [
+        (re.compile(r'^/api/projects/(?P<project_id>[^/]+)$'), _delete_project),
+    ]
+
+
+# Threaded server: dashboard polls keep being served while a blocking
+# LLM subprocess call runs in another request thread. Daemon threads so
+# Ctrl-C doesn't hang on an in-flight 90s claude call; HTTPServer
+# already sets allow_reuse_address for clean restarts.
+http.server.ThreadingHTTPServer.daemon_threads = True
 
 if __name__ == "__main__":
-    with socketserver.TCPServer(("", PORT), AgenticHandler) as httpd:
-        print(f"\n{'='*60}")
-        print(f"  Agent Orchestrator Server")
-        print(f"  Running at http://localhost:{PORT}")
-        print(f"{'='*60}")
-        print(f"\nAgent Mode: {'Claude Code CLI' if USE_NEW_AGENTS else 'Legacy (Heuristics)'}")
-        print(f"\nPhase 1 - Interview Endpoints:")
-        print(f"  POST /api/start_interview      - Start new project interview")
-        print(f"  POST /api/refine_interview     - Refine with answers to questions")
-        print(f"\nPhase 2 - Architecture Endpoints:")
-        print(f"  POST /api/projects/<id>/architecture - Generate architecture")
-        print(f"  POST /api/projects/<id>/approve      - Approve and advance phase")
-        print(f"  POST /api/analyze                    - Analyze codebase")
-        print(f"\nData Endpoints:")
-        print(f"  GET  /api/projects             - List all projects")
-        print(f"  GET  /api/projects/<id>/graph  - Get project graph data")
-        print(f"  GET  /api/components/<id>      - Get component details")
-        print(f"  GET  /api/agents               - List all agents")
-        print(f"  PATCH /api/components/<id>     - Update component")
-        print(f"  PATCH /api/projects/<id>       - Update project")
-        print(f"\nUtility Endpoints:")
-        print(f"  GET  /api/status               - Server status")
-        print(f"  GET  /open?path=<path>         - Open file in editor")
-        print(f"\n{'='*60}\n")
+    with http.server.ThreadingHTTPServer(("", PORT), AgenticHandler) as httpd:
+        # One record (and one stdout write) instead of a print per line.
+        logger.info(
+            f"\n{'='*60}\n"
+            f"  Agent Orchestrator Server\n"
+            f"  Running at http://localhost:{PORT}\n"
+            f"{'='*60}\n"
+            f"\nAgent Mode: {'Claude Code CLI' if USE_NEW_AGENTS else 'Legacy (Heuristics)'}\n"
+            f"\nPhase 1 - Interview Endpoints:\n"
+            f"  POST /api/start_interview      - Start new project interview\n"
+            f"  POST /api/refine_interview     - Refine with answers to questions\n"
+            f"\nPhase 2 - Architecture Endpoints:\n"
+            f"  POST /api/projects/<id>/architecture - Generate architecture\n"
+            f"  POST /api/projects/<id>/approve      - Approve and advance phase\n"
+            f"  POST /api/analyze                    - Analyze codebase\n"
+            f"\nData Endpoints:\n"
+            f"  GET  /api/projects             - List all projects\n"
+            f"  GET  /api/projects/<id>/graph  - Get project graph data\n"
+            f"  GET  /api/components/<id>      - Get component details\n"
+            f"  GET  /api/agents               - List all agents\n"
+            f"  PATCH /api/components/<id>     - Update component\n"
+            f"  PATCH /api/projects/<id>       - Update project\n"
+            f"\nUtility Endpoints:\n"
+            f"  GET  /api/status               - Server status\n"
+            f"  GET  /open?path=<path>         - Open file in editor\n"
+            f"\n{'='*60}\n"
+        )
         httpd.serve_forever()